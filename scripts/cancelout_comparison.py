@@ -0,0 +1,101 @@
+import json
+import os
+import subprocess
+import sys
+from time import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append('src')
+
+
+DATASETS_PATH = 'datasets'
+RESULTS_PATH = 'results'
+DATASETS = {
+    'xor_500samples_50features': 2,
+    'xor2_500samples_64features': 2,
+    'xor3_500samples_256features': 3,
+    'synth_100samples_5000features_50informative': 50,
+}
+# framework imports each selector pays for, timed in a fresh interpreter
+FRAMEWORKS = {
+    'keras': 'import tensorflow, keras',
+    'torch': 'import torch',
+}
+
+
+def _status(field):
+    # current value of a /proc/self/status field, e.g. VmRSS in kB
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(field):
+                return int(line.split()[1])
+
+
+def child(variant, dataset_name, n_informative):
+    from data.loader import DatasetLoader
+    from data.datasets_config import datasets_relative_paths
+
+    X, y, _ = DatasetLoader(DATASETS_PATH, normalize=True).load_csv(
+        datasets_relative_paths[dataset_name], to_drop=['samples'])
+
+    if variant == 'keras':
+        from feature_selectors.cancelout import CancelOutFeatureSelector as Selector
+    else:
+        from feature_selectors.cancelout_torch import CancelOutTorchFeatureSelector as Selector
+
+    rss_before = _status('VmRSS')
+    start = time()
+    selector = Selector().fit(X, y, n_informative)
+    fit_time = time() - start
+
+    print(json.dumps({
+        'fit_time': fit_time,
+        'fit_rss_mb': (_status('VmRSS') - rss_before) / 1024,
+        'peak_rss_mb': _status('VmHWM') / 1024,
+        'threads': _status('Threads'),
+        'epochs': selector.get_epochs(),
+        'rank': [int(f) for f in selector.get_rank()[:2 * n_informative]],
+    }))
+
+
+def run(*args):
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, check=True).stdout
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        child(sys.argv[2], sys.argv[3], int(sys.argv[4]))
+        sys.exit(0)
+
+    startup = {}
+    for variant, statement in FRAMEWORKS.items():
+        start = time()
+        run('-c', statement)
+        startup[variant] = time() - start
+
+    rows = []
+    for dataset_name, n_informative in DATASETS.items():
+        ranks = {}
+        for variant in FRAMEWORKS:
+            try:
+                output = run(__file__, '--child', variant, dataset_name, str(n_informative))
+                row = json.loads(output.strip().splitlines()[-1])
+            except subprocess.CalledProcessError as e:
+                print(f"Skipping {dataset_name} ({variant}): {e.stderr.strip().splitlines()[-1]}")
+                continue
+
+            ranks[variant] = row.pop('rank')
+            row = {'dataset': dataset_name, 'variant': variant, 'startup_time': startup[variant], **row}
+            row['informative_in_top_2k'] = int(np.sum(np.array(ranks[variant]) < n_informative))
+            rows.append(row)
+            print(row)
+
+        if len(ranks) == 2:
+            overlap = len(set(ranks['keras']) & set(ranks['torch'])) / (2 * n_informative)
+            print(f"{dataset_name}: top 2k overlap between keras and torch {overlap:.2f}")
+
+    if not os.path.exists(RESULTS_PATH):
+        os.makedirs(RESULTS_PATH)
+    pd.DataFrame(rows).to_csv(os.path.join(RESULTS_PATH, 'cancelout-comparison.csv'), index=False)
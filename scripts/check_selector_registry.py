@@ -0,0 +1,16 @@
+import sys
+
+sys.path.append('src')
+
+from feature_selectors import feature_selectors
+
+
+# the registry describes every selector by hand so runs can schedule tasks without
+# importing them; this imports them all and fails when a description drifted
+if __name__ == '__main__':
+    mismatches = feature_selectors.verify()
+    for name, fields in mismatches.items():
+        print(f"Registry entry of {name} does not match its class in {fields}")
+    if mismatches:
+        sys.exit(1)
+    print(f"{len(feature_selectors)} registry entries match their classes")
@@ -0,0 +1,68 @@
+import os
+import sys
+from time import time
+
+import numpy as np
+import pandas as pd
+import torch
+from sklearn.datasets import make_classification
+
+sys.path.append('src')
+
+from feature_selectors.deeppink import Deeppink
+from feature_selectors.fsnet import FSNetFeatureSelector
+
+
+RESULTS_PATH = 'results'
+# stand-in for the large expression sets: many samples, moderate width
+N_SAMPLES = 20000
+N_FEATURES = 500
+N_INFORMATIVE = 10
+EPOCHS = 5
+PROCESSES = [1, 2, 4]
+SELECTORS = {
+    'Deeppink': lambda **params: Deeppink(epochs=EPOCHS, **params),
+    'FSNet': lambda **params: FSNetFeatureSelector(epochs=EPOCHS, **params),
+}
+
+
+def fit_time(factory, X, y, n_procs, n_threads):
+    selector = factory(seed=0, n_procs=n_procs, n_threads=n_threads)
+    start = time()
+    selector.fit(X, y, N_INFORMATIVE)
+    return time() - start, np.array(selector.get_weights())
+
+
+if __name__ == '__main__':
+    X, y = make_classification(
+        N_SAMPLES, N_FEATURES, n_informative=N_INFORMATIVE, n_redundant=0, shuffle=False, random_state=0)
+    X = X.astype(np.float32)
+    # every configuration uses the same number of cores in total
+    total_threads = torch.get_num_threads()
+    rows = []
+
+    for selector_name, factory in SELECTORS.items():
+        reference_time, reference_weights = None, None
+        for n_procs in PROCESSES:
+            n_threads = max(1, total_threads // n_procs)
+            time_spent, weights = fit_time(factory, X, y, n_procs, n_threads)
+            if reference_time is None:
+                reference_time, reference_weights = time_spent, weights
+
+            speedup = reference_time / time_spent
+            row = {
+                'selector': selector_name,
+                'processes': n_procs,
+                'threads_per_process': n_threads,
+                'time': time_spent,
+                'speedup': speedup,
+                'efficiency': speedup / n_procs,
+                'informative_in_top_k': int(np.sum(np.argsort(weights)[::-1][:N_INFORMATIVE] < N_INFORMATIVE)),
+                'weights_correlation': np.corrcoef(weights, reference_weights)[0, 1],
+            }
+            rows.append(row)
+            print(row)
+
+    if not os.path.exists(RESULTS_PATH):
+        os.makedirs(RESULTS_PATH)
+    pd.DataFrame(rows).to_csv(os.path.join(RESULTS_PATH, 'data-parallel-scaling.csv'), index=False)
@@ -0,0 +1,88 @@
+import os
+import sys
+from time import time
+
+import numpy as np
+import pandas as pd
+import torch
+
+sys.path.append('src')
+
+from data.loader import DatasetLoader
+from data.datasets_config import datasets_relative_paths
+from feature_selectors.base_models.nn_models.fsnet import FSNet
+from feature_selectors.base_models.nn_models.nn_wrapper import Model
+
+
+DATASETS_PATH = 'datasets'
+RESULTS_PATH = 'results'
+DATASETS = [
+    'xor_500samples_50features',
+    'xor2_500samples_64features',
+    'xor2_500samples_1024features',
+    'xor3_500samples_64features',
+    'xor3_500samples_1024features',
+    'synth_100samples_5000features_50informative',
+]
+N_BINS = 30
+N_EPOCHS = 50
+
+
+def per_column_compute_u(X, n_bins):
+    # reference: one np.histogram call and host copy per feature
+    n_features = X.shape[1]
+    U = np.zeros((n_features, n_bins), dtype=float)
+    for j in range(0, n_features):
+        hist = np.histogram(X[:, j].cpu().numpy(), n_bins)
+        U[j, :] = 0.5 * hist[0][:] * (hist[1][:-1] + hist[1][1:])
+    U -= U.mean()
+    U /= U.std()
+    return torch.tensor(U, dtype=torch.float32)
+
+
+def timed(func, *args, **kwargs):
+    start = time()
+    result = func(*args, **kwargs)
+    return result, time() - start
+
+
+def fit_time(X, y, n_classes, check_nan_every):
+    torch.manual_seed(0)
+    n_selected = 4
+    fsnet = FSNet(Model(n_selected, n_classes), X.shape[1], N_BINS, n_selected, n_classes)
+    _, spent = timed(fsnet.fit, X, y, n_epochs=N_EPOCHS, check_nan_every=check_nan_every)
+    return spent
+
+
+loader = DatasetLoader(DATASETS_PATH, normalize=True)
+rows = []
+
+for dataset_name in DATASETS:
+    try:
+        X, y, _ = loader.load_csv(datasets_relative_paths[dataset_name], to_drop=['samples'])
+    except Exception as e:
+        print(f"Skipping {dataset_name}: {e}")
+        continue
+
+    _, y = np.unique(y, return_inverse=True)
+    X_tensor = torch.tensor(X, dtype=torch.float32)
+    y_tensor = torch.tensor(y, dtype=torch.long)
+    n_classes = len(np.unique(y))
+
+    U_reference, reference_time = timed(per_column_compute_u, X_tensor, N_BINS)
+    U, vectorized_time = timed(FSNet.compute_u, X_tensor, N_BINS)
+
+    row = {
+        'dataset': dataset_name,
+        'compute_u_per_column': reference_time,
+        'compute_u_vectorized': vectorized_time,
+        'compute_u_max_abs_diff': (U - U_reference).abs().max().item(),
+        f'fit_{N_EPOCHS}_epochs_nan_checks': fit_time(X_tensor, y_tensor, n_classes, check_nan_every=10),
+        f'fit_{N_EPOCHS}_epochs': fit_time(X_tensor, y_tensor, n_classes, check_nan_every=0),
+    }
+    rows.append(row)
+    print(row)
+
+if not os.path.exists(RESULTS_PATH):
+    os.makedirs(RESULTS_PATH)
+pd.DataFrame(rows).to_csv(os.path.join(RESULTS_PATH, 'fsnet-benchmark.csv'), index=False)
@@ -0,0 +1,78 @@
+import os
+import subprocess
+import sys
+
+import pandas as pd
+
+sys.path.append('src')
+
+from feature_selectors import feature_selectors
+
+
+SOURCE_PATH = 'src'
+RESULTS_PATH = 'results'
+REPEATS = 3
+FRAMEWORKS = ['tensorflow', 'keras', 'torch', 'lassonet', 'captum']
+# what a run imports before any selector, then each selector's own module
+STARTUP_MODULES = ['main', 'task.task_factory', 'task.runner', 'task.scheduler', 'task.worker_setup', 'results.loader']
+# selectors that must stay importable without any framework
+CLASSICAL_SELECTORS = [
+    'DecisionTree', 'KruskallWallisFilter', 'Lasso', 'LassoPath', 'LinearSVM', 'LinearSVMPath', 'MRMR',
+    'MutualInformationFilter', 'RandomForest', 'ReliefFFeatureSelector', 'SVMFowardSelection', 'SVMRFE',
+]
+
+
+def import_time(module):
+    """
+    Imports `module` in a fresh interpreter under `-X importtime`, returns the cumulative
+    time of its import in seconds and the top-level packages it loaded.
+    """
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=SOURCE_PATH, capture_output=True, text=True, check=True
+    )
+    cumulative, packages = None, set()
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        # import time: self [us] | cumulative | imported package, nested ones indented
+        _, us, name = line[len('import time:'):].split('|')
+        name = name.strip()
+        packages.add(name.split('.')[0])
+        if name == module:
+            cumulative = int(us) / 1e6
+    return cumulative, packages
+
+
+if __name__ == '__main__':
+    modules = {module: 'startup' for module in STARTUP_MODULES}
+    for name in feature_selectors:
+        modules.setdefault(feature_selectors.module(name), 'classical' if name in CLASSICAL_SELECTORS else 'dnn-based')
+
+    rows = []
+    for module, kind in modules.items():
+        measures = [import_time(module) for _ in range(REPEATS)]
+        loaded = [framework for framework in FRAMEWORKS if framework in measures[0][1]]
+        row = {
+            'module': module,
+            'kind': kind,
+            'import_time': min(time_spent for time_spent, _ in measures),
+            'frameworks': ' '.join(loaded),
+        }
+        rows.append(row)
+        print(row)
+
+    if not os.path.exists(RESULTS_PATH):
+        os.makedirs(RESULTS_PATH)
+    pd.DataFrame(rows).to_csv(os.path.join(RESULTS_PATH, 'import-time-benchmark.csv'), index=False)
+
+    # guards the lazy registry: startup and classical selectors never load a framework,
+    # and the descriptions that let a run skip importing selectors match the classes
+    heavy = [row['module'] for row in rows if row['kind'] != 'dnn-based' and row['frameworks']]
+    if heavy:
+        print(f"Frameworks imported by {', '.join(heavy)}")
+    mismatches = feature_selectors.verify()
+    for name, fields in mismatches.items():
+        print(f"Registry entry of {name} does not match its class in {fields}")
+    if heavy or mismatches:
+        sys.exit(1)
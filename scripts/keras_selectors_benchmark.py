@@ -0,0 +1,73 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append('src')
+
+from data.loader import DatasetLoader
+from data.datasets_config import datasets_relative_paths
+from feature_selectors.cae import CAEFeatureSelector
+from feature_selectors.cancelout import CancelOutFeatureSelector
+
+
+DATASETS_PATH = 'datasets'
+RESULTS_PATH = 'results'
+DATASETS = {
+    'xor_500samples_50features': 2,
+    'xor2_500samples_1024features': 2,
+    'xor3_500samples_1024features': 3,
+    'synth_100samples_5000features_50informative': 50,
+}
+EPOCHS = 40
+SELECTORS = {
+    'CancelOut': lambda **params: CancelOutFeatureSelector(epochs=EPOCHS, **params),
+    'CAE': lambda **params: CAEFeatureSelector(epochs=EPOCHS, **params),
+}
+VARIANTS = {
+    'numpy': {'tf_data': False, 'jit_compile': False},
+    'tf_data': {'tf_data': True, 'jit_compile': 'auto'},
+    'tf_data_jit': {'tf_data': True, 'jit_compile': True},
+}
+CAE_BATCH_SIZES = [None, 64]
+
+
+def epoch_times(selector):
+    # CancelOut keeps the Keras model on the embedded selector
+    return getattr(selector, 'epoch_times_', None) or selector._model.epoch_times_
+
+
+loader = DatasetLoader(DATASETS_PATH, normalize=True)
+rows = []
+
+for dataset_name, n_informative in DATASETS.items():
+    try:
+        X, y, _ = loader.load_csv(datasets_relative_paths[dataset_name], to_drop=['samples'])
+    except Exception as e:
+        print(f"Skipping {dataset_name}: {e}")
+        continue
+
+    for selector_name, factory in SELECTORS.items():
+        batch_sizes = CAE_BATCH_SIZES if selector_name == 'CAE' else [None]
+        for batch_size, (variant, params) in [(b, v) for b in batch_sizes for v in VARIANTS.items()]:
+            if batch_size is not None:
+                params = {**params, 'batch_size': batch_size}
+            selector = factory(**params).fit(X, y, n_informative)
+            times = epoch_times(selector)
+
+            row = {
+                'dataset': dataset_name,
+                'selector': selector_name,
+                'variant': variant,
+                'batch_size': batch_size,
+                # the first epoch includes tracing and compilation
+                'first_epoch': times[0],
+                'epoch_mean': np.mean(times[1:]),
+            }
+            rows.append(row)
+            print(row)
+
+if not os.path.exists(RESULTS_PATH):
+    os.makedirs(RESULTS_PATH)
+pd.DataFrame(rows).to_csv(os.path.join(RESULTS_PATH, 'keras-selectors-benchmark.csv'), index=False)
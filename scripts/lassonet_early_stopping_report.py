@@ -0,0 +1,73 @@
+import os
+import sys
+from time import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append('src')
+
+from data.loader import DatasetLoader
+from data.datasets_config import datasets_relative_paths
+from evaluation.measures import jaccard_score, spearmans_correlation_partial_ranked_list
+from feature_selectors.lassonet import LassoNetFeatureSelector
+
+
+DATASETS_PATH = 'datasets'
+RESULTS_PATH = 'results'
+DATASETS = {
+    'xor_500samples_50features': 2,
+    'xor2_500samples_64features': 2,
+    'xor3_500samples_64features': 3,
+    'synth_100samples_5000features_50informative': 50,
+}
+VARIANTS = {
+    'full_path': {},
+    'early_stopping': {'early_stopping': True},
+    'early_stopping_adaptive': {'early_stopping': True, 'adaptive_multiplier': True, 'rank_patience': 5},
+}
+TOP_K = [5, 10, 20, 50]
+
+
+def fit_rank(X, y, n_informative, params):
+    selector = LassoNetFeatureSelector(**params)
+    start = time()
+    selector.fit(X, y, n_informative)
+    return np.array(selector.get_rank()), time() - start, selector.path_steps_
+
+
+loader = DatasetLoader(DATASETS_PATH, normalize=True)
+rows = []
+
+for dataset_name, n_informative in DATASETS.items():
+    try:
+        X, y, _ = loader.load_csv(datasets_relative_paths[dataset_name], to_drop=['samples'])
+    except Exception as e:
+        print(f"Skipping {dataset_name}: {e}")
+        continue
+
+    reference_rank, reference_time, _ = fit_rank(X, y, n_informative, VARIANTS['full_path'])
+
+    for variant, params in VARIANTS.items():
+        if variant == 'full_path':
+            rank, time_spent, steps = reference_rank, reference_time, None
+        else:
+            rank, time_spent, steps = fit_rank(X, y, n_informative, params)
+
+        row = {
+            'dataset': dataset_name,
+            'variant': variant,
+            'path_steps': steps,
+            'time': time_spent,
+            'speedup': reference_time / time_spent,
+        }
+        for k in TOP_K:
+            if k <= X.shape[1]:
+                row[f'jaccard@{k}'] = jaccard_score(set(rank[:k]), set(reference_rank[:k]))
+                row[f'spearman@{k}'] = spearmans_correlation_partial_ranked_list(rank[:k], reference_rank[:k])
+        rows.append(row)
+        print(row)
+
+if not os.path.exists(RESULTS_PATH):
+    os.makedirs(RESULTS_PATH)
+pd.DataFrame(rows).to_csv(os.path.join(RESULTS_PATH, 'lassonet-early-stopping-report.csv'), index=False)
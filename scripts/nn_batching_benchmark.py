@@ -0,0 +1,95 @@
+import os
+import sys
+from time import time
+
+import numpy as np
+import pandas as pd
+import torch
+
+sys.path.append('src')
+
+from data.loader import DatasetLoader
+from data.datasets_config import datasets_relative_paths
+from feature_selectors.deeppink import Deeppink
+from feature_selectors.fsnet import FSNetFeatureSelector
+from feature_selectors.base_models.nn_models import fsnet, nn_wrapper
+from feature_selectors.base_models.nn_models.utils import TensorBatches, TrainingSet
+
+
+DATASETS_PATH = 'datasets'
+RESULTS_PATH = 'results'
+DATASETS = {
+    'xor_500samples_50features': 2,
+    'xor2_500samples_64features': 2,
+    'xor3_500samples_256features': 3,
+    'synth_100samples_5000features_50informative': 50,
+}
+
+
+class DataLoaderBatches:
+    """
+    Previous batching path: a `DataLoader` over `TrainingSet`, used as the baseline.
+    """
+
+    def __init__(self, X, Y, batch_size=64, shuffle=True, **kwargs):
+        self._loader = torch.utils.data.DataLoader(TrainingSet(X, Y, X.device), batch_size=batch_size, shuffle=shuffle)
+        self._dtype = Y.dtype
+
+    def __len__(self):
+        return len(self._loader)
+
+    def __iter__(self):
+        for x, y in self._loader:
+            yield x, y.to(self._dtype)
+
+
+def use_batches(batches):
+    nn_wrapper.TensorBatches = batches
+    fsnet.TensorBatches = batches
+
+
+def fit_time(selector_factory, X, y, n_informative):
+    torch.manual_seed(0)
+    np.random.seed(0)
+    selector = selector_factory()
+    start = time()
+    selector.fit(X, y, n_informative)
+    return time() - start
+
+
+SELECTORS = {
+    'Deeppink': lambda: Deeppink(),
+    'FSNet': lambda: FSNetFeatureSelector(),
+    'Deeppink_full_batch': lambda: Deeppink(full_batch_threshold=1000),
+    'FSNet_full_batch': lambda: FSNetFeatureSelector(full_batch_threshold=1000),
+}
+
+loader = DatasetLoader(DATASETS_PATH, normalize=True)
+rows = []
+
+for dataset_name, n_informative in DATASETS.items():
+    try:
+        X, y, _ = loader.load_csv(datasets_relative_paths[dataset_name], to_drop=['samples'])
+    except Exception as e:
+        print(f"Skipping {dataset_name}: {e}")
+        continue
+
+    for selector_name, factory in SELECTORS.items():
+        row = {'dataset': dataset_name, 'selector': selector_name}
+
+        if not selector_name.endswith('full_batch'):
+            use_batches(DataLoaderBatches)
+            row['dataloader'] = fit_time(factory, X, y, n_informative)
+
+        use_batches(TensorBatches)
+        row['tensor_batches'] = fit_time(factory, X, y, n_informative)
+
+        if 'dataloader' in row:
+            row['speedup'] = row['dataloader'] / row['tensor_batches']
+
+        rows.append(row)
+        print(row)
+
+if not os.path.exists(RESULTS_PATH):
+    os.makedirs(RESULTS_PATH)
+pd.DataFrame(rows).to_csv(os.path.join(RESULTS_PATH, 'nn-batching-benchmark.csv'), index=False)
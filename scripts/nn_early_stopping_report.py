@@ -0,0 +1,91 @@
+import os
+import sys
+from time import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append('src')
+
+from data.loader import DatasetLoader
+from data.datasets_config import datasets_relative_paths
+from evaluation.measures import jaccard_score
+from feature_selectors.cae import CAEFeatureSelector
+from feature_selectors.cancelout import CancelOutFeatureSelector
+from feature_selectors.cancelout_torch import CancelOutTorchFeatureSelector
+from feature_selectors.deeppink import Deeppink
+from feature_selectors.fsnet import FSNetFeatureSelector
+
+
+DATASETS_PATH = 'datasets'
+RESULTS_PATH = 'results'
+FEATURE_COUNTS = [8, 16, 32, 64, 128, 256, 512, 1024]
+DATASETS = {
+    **{f'xor2_500samples_{n}features': 2 for n in FEATURE_COUNTS},
+    **{f'xor3_500samples_{n}features': 3 for n in FEATURE_COUNTS},
+}
+SELECTORS = {
+    'Deeppink': Deeppink,
+    'FSNet': FSNetFeatureSelector,
+    'CancelOut': CancelOutFeatureSelector,
+    'CancelOutTorch': CancelOutTorchFeatureSelector,
+    'CAE': CAEFeatureSelector,
+}
+VARIANTS = {
+    'full': None,
+    'top_k': {'check_every': 10, 'patience': 3},
+    'spearman': {'check_every': 10, 'patience': 3, 'min_correlation': 0.95},
+}
+
+
+def top_features(selector, k):
+    try:
+        return np.array(selector.get_rank())[:k]
+    except Exception:
+        # subset selectors have no rank, their subset is their top features
+        return np.array(selector.get_selected())[:k]
+
+
+def fit(selector_class, X, y, n_informative, early_stopping):
+    selector = selector_class(early_stopping=early_stopping)
+    start = time()
+    selector.fit(X, y, n_informative)
+    return selector, time() - start
+
+
+loader = DatasetLoader(DATASETS_PATH, normalize=True)
+rows = []
+
+for dataset_name, n_informative in DATASETS.items():
+    try:
+        X, y, _ = loader.load_csv(datasets_relative_paths[dataset_name], to_drop=['samples'])
+    except Exception as e:
+        print(f"Skipping {dataset_name}: {e}")
+        continue
+
+    k = 2 * n_informative
+    for selector_name, selector_class in SELECTORS.items():
+        reference = None
+        for variant, early_stopping in VARIANTS.items():
+            selector, time_spent = fit(selector_class, X, y, n_informative, early_stopping)
+            top = top_features(selector, k)
+            if reference is None:
+                reference, reference_time = top, time_spent
+
+            row = {
+                'dataset': dataset_name,
+                'selector': selector_name,
+                'variant': variant,
+                'epochs': selector.get_epochs(),
+                'time': time_spent,
+                'speedup': reference_time / time_spent,
+                # informative features are the first `n_informative` columns
+                'informative_in_top_2k': int(np.sum(top < n_informative)),
+                'jaccard_to_full': jaccard_score(set(top), set(reference)),
+            }
+            rows.append(row)
+            print(row)
+
+if not os.path.exists(RESULTS_PATH):
+    os.makedirs(RESULTS_PATH)
+pd.DataFrame(rows).to_csv(os.path.join(RESULTS_PATH, 'nn-early-stopping-report.csv'), index=False)
@@ -0,0 +1,68 @@
+import os
+import sys
+from time import time
+
+import pandas as pd
+from sklearn.datasets import make_classification
+
+sys.path.append('src')
+
+from task.executor import ResourceExecutor
+from task.model import Task
+from util.thread_policy import ThreadPolicy
+
+
+RESULTS_PATH = 'results'
+N_SAMPLES = 300
+N_FEATURES = 2000
+N_INFORMATIVE = 10
+TASKS_PER_SELECTOR = 8
+# the selectors use their defaults, i.e. n_jobs=-1 and BLAS threads as large as the machine
+SELECTORS = ['Lasso', 'LinearSVM', 'DecisionTree', 'RandomForest']
+POLICIES = {
+    'no limits': None,
+    'thread limits': ThreadPolicy(),
+    'thread limits + pinning': ThreadPolicy(pin_cores=True),
+}
+
+X, y = make_classification(N_SAMPLES, N_FEATURES, n_informative=N_INFORMATIVE, n_redundant=0, shuffle=False, random_state=0)
+
+
+def fit(task):
+    # workers are forked, the data is shared with them
+    task.feature_selector.fit(X, y, task.n_informative)
+
+
+def make_tasks():
+    return [
+        Task(name, 'synthetic', N_INFORMATIVE)
+        for name in SELECTORS
+        for _ in range(TASKS_PER_SELECTOR)
+    ]
+
+
+if __name__ == '__main__':
+    num_cores = os.cpu_count()
+    rows = []
+
+    for policy_name, policy in POLICIES.items():
+        tasks = make_tasks()
+        executor = ResourceExecutor(num_cores, thread_policy=policy)
+        start = time()
+        failed = executor.run(fit, tasks)
+        time_spent = time() - start
+
+        row = {
+            'policy': policy_name,
+            'workers': num_cores,
+            'tasks': len(tasks),
+            'failed': failed,
+            'time': time_spent,
+            'tasks_per_second': len(tasks) / time_spent,
+        }
+        rows.append(row)
+        print(row)
+
+    if not os.path.exists(RESULTS_PATH):
+        os.makedirs(RESULTS_PATH)
+    pd.DataFrame(rows).to_csv(os.path.join(RESULTS_PATH, 'thread-policy-benchmark.csv'), index=False)
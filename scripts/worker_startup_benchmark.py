@@ -0,0 +1,70 @@
+import os
+import sys
+from time import time
+
+import pandas as pd
+
+sys.path.append('src')
+
+from data.dataset_manager import DatasetManager
+from data.datasets_config import datasets_relative_paths
+from task.executor import ResourceExecutor
+from task.runner import TaskRunner
+from task.task_factory import tasks_from_presets, get_datasets_from_presets
+from task.worker_setup import preload_datasets, preload_modules, setup_worker
+
+
+DATASETS_PATH = 'datasets'
+RESULTS_PATH = 'results'
+PRESETS = sys.argv[1:] or ['test_preset']
+START_METHODS = ['spawn', 'fork', 'forkserver']
+NUM_WORKERS = os.cpu_count()
+
+
+def build_selector(task):
+    # the work every task does before fitting: frameworks, datasets and the selector
+    from util.shared_resources import SharedResources
+    SharedResources.get()['datasets'].get_dataset(task.dataset_name)
+    task.feature_selector
+    return []
+
+
+def run(start_method, fn, tasks, datasets, dataset_paths):
+    if start_method == 'fork':
+        initargs = (datasets, None)
+    else:
+        preload_datasets(DATASETS_PATH, dataset_paths)
+        initargs = (None, None)
+    preload = preload_modules({task.name for task in tasks})
+    executor = ResourceExecutor(NUM_WORKERS, setup_worker, initargs, start_method=start_method, preload=preload)
+
+    start = time()
+    failed = executor.run(fn, tasks)
+    return time() - start, failed
+
+
+if __name__ == '__main__':
+    used_datasets = get_datasets_from_presets(PRESETS)
+    dataset_paths = {name: path for name, path in datasets_relative_paths.items() if name in used_datasets}
+    datasets = DatasetManager(DATASETS_PATH, dataset_paths, normalize=True)
+    tasks = tasks_from_presets(PRESETS, category_filter=['classical', 'dnn-based'])
+    rows = []
+
+    for start_method in START_METHODS:
+        # startup alone, then the whole preset
+        for workload, fn in (('startup', build_selector), ('preset', TaskRunner(verbose=0).run)):
+            time_spent, failed = run(start_method, fn, tasks, datasets, dataset_paths)
+            row = {
+                'start_method': start_method,
+                'workload': workload,
+                'tasks': len(tasks),
+                'failed': failed,
+                'time': time_spent,
+                'time_per_task': time_spent / max(1, len(tasks)) * NUM_WORKERS,
+            }
+            rows.append(row)
+            print(row)
+
+    if not os.path.exists(RESULTS_PATH):
+        os.makedirs(RESULTS_PATH)
+    pd.DataFrame(rows).to_csv(os.path.join(RESULTS_PATH, 'worker-startup-benchmark.csv'), index=False)
@@ -29,6 +29,9 @@ class DatasetManager:
             except Exception as e:
                 print(f"{RED_COLOR}Could not load {path}: {e}{DEFAULT_COLOR}")
 
+    def names(self):
+        return list(self._datasets.keys())
+
     def get_dataset(self, name: str) -> Dataset:
         try:
             return self._datasets[name]
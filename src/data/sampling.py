@@ -10,12 +10,23 @@ class SamplingType(Enum):
     BOOTSTRAP = 'bootstrap'
     PERCENT_90 = 'percent90'
 
+def bootstrap_indices(n):
+    return np.random.choice(n, n)
+
+def percent90_indices(n):
+    return np.random.choice(n, int(n * 0.9), replace=False)
+
+def sampling_indices(sampling, n):
+    if sampling == SamplingType.BOOTSTRAP.value:
+        return bootstrap_indices(n)
+    elif sampling == SamplingType.PERCENT_90.value:
+        return percent90_indices(n)
+    return np.arange(n)
+
 def bootstrap(X, y=None):
-    n = X.shape[0]
-    idx = np.random.choice(n, n)
+    idx = bootstrap_indices(X.shape[0])
     return (X[idx], y[idx]) if y is not None else X[idx]
 
 def percent90(X, y=None):
-    n = X.shape[0]
-    idx = np.random.choice(n, int(n * 0.9), replace=False)
-    return (X[idx], y[idx]) if y is not None else X[idx]
\ No newline at end of file
+    idx = percent90_indices(X.shape[0])
+    return (X[idx], y[idx]) if y is not None else X[idx]
@@ -7,6 +7,7 @@ import pandas as pd
 from itertools import combinations
 
 from results.loader import ResultsLoader
+from util.thread_policy import ThreadPolicy
 from .util import rank_from_weights, keep_top_k
 
 from evaluation.measures import (
@@ -184,7 +185,8 @@ class ResultsStability:
             print(f"Grouped results in {len(groups)} groups.")
 
         if n_workers > 1:
-            with Pool(n_workers) as pool:
+            # one single-threaded worker per core
+            with Pool(n_workers, ThreadPolicy(n_threads=1).apply) as pool:
                 args = [
                     (g, evaluate_at, evaluate_at_all_features, verbose)
                     for g in groups
@@ -1,33 +1,150 @@
-from .cancelout import CancelOutFeatureSelector
-from .decision_tree import DecisionTreeFeatureSelector
-from .kruskall_wallis_filter import KruskalWallisFeatureSelector
-from .lasso import LassoFeatureSelector
-from .lassonet import LassoNetFeatureSelector
-from .deeppink import Deeppink
-from .cae import CAEFeatureSelector
-from .fsnet import FSNetFeatureSelector
-from .linear_svm import LinearSVMFeatureSelector
-from .mrmr import MRMRFeatureSelector
-from .mutual_info_filter import MutualInformationFeatureSelector
-from .random_forest import RandomForestFeatureSelector
-from .relieff import ReliefFFeatureSelector
-from .svm_forward_selector import SVMForwardFeatureSelector
-from .svm_rfe import SVMRFE
-
-feature_selectors = {
-    "Cancelout": CancelOutFeatureSelector,
-    "DecisionTree": DecisionTreeFeatureSelector,
-    "KruskallWallisFilter": KruskalWallisFeatureSelector,
-    "Lasso": LassoFeatureSelector,
-    "LassoNet": LassoNetFeatureSelector,
-    "Deeppink": Deeppink,
-    "CAE": CAEFeatureSelector,
-    "FSNet" : FSNetFeatureSelector,
-    "LinearSVM": LinearSVMFeatureSelector,
-    "MRMR": MRMRFeatureSelector,
-    "MutualInformationFilter": MutualInformationFeatureSelector,
-    "RandomForest": RandomForestFeatureSelector,
-    "ReliefFFeatureSelector": ReliefFFeatureSelector,
-    "SVMFowardSelection": SVMForwardFeatureSelector,
-    "SVMRFE": SVMRFE,
+import importlib
+import inspect
+from collections.abc import Mapping
+from typing import NamedTuple, Optional
+
+from .base_models import ForwardFeatureSelector, RFE, ResultType
+
+
+class SelectorInfo(NamedTuple):
+    """
+    Where a selector is defined and what scheduling its tasks needs to know about it,
+    available without importing the selector.
+    """
+    module: str
+    class_name: str
+    result_type: ResultType
+    supports_warm_start: bool = False
+    supports_replicates: bool = False
+    # refits a model for every feature it eliminates or adds
+    wrapper: bool = False
+    # where warm-startable selectors take `warm_start` when params are given as a list
+    warm_start_position: Optional[int] = None
+    n_features_default: Optional[int] = None
+
+    def spec_params(self):
+        """
+        The constructor parameters read from task specs, as (position, default): every
+        selector takes `n_features` first, warm-startable ones also `warm_start`.
+        """
+        params = {'n_features': (0, self.n_features_default)}
+        if self.supports_warm_start:
+            params['warm_start'] = (self.warm_start_position, False)
+        return params
+
+
+class SelectorRegistry(Mapping):
+    """
+    Selector classes by name, imported on first lookup.
+
+    Each entry only describes a selector, so importing the registry does not import
+    TensorFlow, torch or any other framework: a classical-only run never loads them, and
+    a process that only schedules tasks (`info`, `spec_param`) never imports a selector.
+    The description is checked against the class once it is imported, and against every
+    class by `verify`, which `make lint` and the import time benchmark run.
+    """
+
+    def __init__(self, entries):
+        self._entries = entries
+
+    def info(self, name) -> SelectorInfo:
+        return self._entries[name]
+
+    def module(self, name):
+        """
+        Full name of the module defining selector `name`, e.g. to preload it.
+        """
+        return f'{__name__}.{self._entries[name].module}'
+
+    def spec_param(self, name, params, param):
+        """
+        Value selector `name` gets for the constructor parameter `param` from `params`,
+        positional or by name, without importing it; see `SelectorInfo.spec_params`.
+        """
+        spec_params = self._entries[name].spec_params()
+        if param not in spec_params:
+            raise ValueError(f"{param} of {name} cannot be read from a task spec, only {list(spec_params)}")
+        position, default = spec_params[param]
+        if isinstance(params, dict):
+            return params.get(param, default)
+        return params[position] if position < len(params) else default
+
+    @staticmethod
+    def _mismatches(info, selector_class):
+        """
+        Fields of `info` that do not describe `selector_class`, including spec params the
+        constructor does not take at the recorded position with the recorded default.
+        """
+        described = {
+            'result_type': selector_class.result_type,
+            'supports_warm_start': selector_class.supports_warm_start,
+            'supports_replicates': selector_class.supports_replicates,
+            'wrapper': issubclass(selector_class, (RFE, ForwardFeatureSelector)),
+        }
+        mismatched = [key for key, value in described.items() if getattr(info, key) != value]
+        parameters = list(inspect.signature(selector_class).parameters.values())
+        for param, (position, default) in info.spec_params().items():
+            if (position is None or position >= len(parameters) or parameters[position].name != param
+                    or parameters[position].default != default):
+                mismatched.append(param)
+        return mismatched
+
+    def verify(self):
+        """
+        Imports every selector and returns the fields of the entries that do not match
+        their class, by selector name; imports all frameworks.
+        """
+        mismatches = {}
+        for name, info in self._entries.items():
+            selector_class = getattr(importlib.import_module(self.module(name)), info.class_name)
+            mismatched = self._mismatches(info, selector_class)
+            if mismatched:
+                mismatches[name] = mismatched
+        return mismatches
+
+    def __getitem__(self, name):
+        info = self._entries[name]
+        selector_class = getattr(importlib.import_module(self.module(name)), info.class_name)
+        mismatched = self._mismatches(info, selector_class)
+        if mismatched:
+            raise TypeError(f"Registry entry of {name} does not match {info.class_name} in {mismatched}")
+        return selector_class
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_selectors = {
+    "Cancelout": SelectorInfo("cancelout", "CancelOutFeatureSelector", ResultType.WEIGHTS),
+    "CanceloutTorch": SelectorInfo("cancelout_torch", "CancelOutTorchFeatureSelector", ResultType.WEIGHTS, supports_warm_start=True, warm_start_position=13),
+    "DecisionTree": SelectorInfo("decision_tree", "DecisionTreeFeatureSelector", ResultType.WEIGHTS, supports_replicates=True),
+    "KruskallWallisFilter": SelectorInfo("kruskall_wallis_filter", "KruskalWallisFeatureSelector", ResultType.WEIGHTS),
+    "Lasso": SelectorInfo("lasso", "LassoFeatureSelector", ResultType.WEIGHTS),
+    "LassoPath": SelectorInfo("lasso", "LassoPathFeatureSelector", ResultType.RANK),
+    "LassoNet": SelectorInfo("lassonet", "LassoNetFeatureSelector", ResultType.WEIGHTS),
+    "Deeppink": SelectorInfo("deeppink", "Deeppink", ResultType.WEIGHTS, supports_warm_start=True, supports_replicates=True, warm_start_position=11),
+    "CAE": SelectorInfo("cae", "CAEFeatureSelector", ResultType.SUBSET),
+    "FSNet": SelectorInfo("fsnet", "FSNetFeatureSelector", ResultType.WEIGHTS, supports_warm_start=True, warm_start_position=8),
+    "LinearSVM": SelectorInfo("linear_svm", "LinearSVMFeatureSelector", ResultType.WEIGHTS),
+    "LinearSVMPath": SelectorInfo("linear_svm", "LinearSVMPathFeatureSelector", ResultType.RANK),
+    "MRMR": SelectorInfo("mrmr", "MRMRFeatureSelector", ResultType.WEIGHTS),
+    "MutualInformationFilter": SelectorInfo("mutual_info_filter", "MutualInformationFeatureSelector", ResultType.WEIGHTS),
+    "RandomForest": SelectorInfo("random_forest", "RandomForestFeatureSelector", ResultType.WEIGHTS, supports_replicates=True),
+    "ReliefFFeatureSelector": SelectorInfo("relieff", "ReliefFFeatureSelector", ResultType.WEIGHTS, n_features_default=20),
+    "SVMFowardSelection": SelectorInfo("svm_forward_selector", "SVMForwardFeatureSelector", ResultType.RANK, wrapper=True),
+    "SVMRFE": SelectorInfo("svm_rfe", "SVMRFE", ResultType.SUBSET, wrapper=True),
 }
+
+feature_selectors = SelectorRegistry(_selectors)
+
+# `from feature_selectors import LassoFeatureSelector` keeps working, importing only its module
+_modules_by_class = {info.class_name: info.module for info in _selectors.values()}
+
+
+def __getattr__(name):
+    if name in _modules_by_class:
+        return getattr(importlib.import_module(f'{__name__}.{_modules_by_class[name]}'), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
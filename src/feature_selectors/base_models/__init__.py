@@ -3,6 +3,8 @@ from .embedded import BaseEmbeddedFeatureSelector
 from .forward_feature_selector import ForwardFeatureSelector
 from .k_best import KBestFeatureSelector
 from .recursive_feature_elimination import RFE
+from .regularization_path import BasePathFeatureSelector
+from .replicate_trees import BaseReplicateTreesFeatureSelector
 
 
 __all__ = [
@@ -10,5 +12,7 @@ __all__ = [
     BaseEmbeddedFeatureSelector,
     ForwardFeatureSelector,
     KBestFeatureSelector,
-    RFE
+    RFE,
+    BasePathFeatureSelector,
+    BaseReplicateTreesFeatureSelector
 ]
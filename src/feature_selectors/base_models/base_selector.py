@@ -12,6 +12,10 @@ class ResultType(Enum):
 
 
 class BaseSelector(ABC):
+    supports_replicates = False
+    supports_warm_start = False
+    supports_data_parallel = False
+
     def __init__(self, n_features: int):
         self._n_features = n_features
 
@@ -20,6 +24,8 @@ class BaseSelector(ABC):
         self._selected = None
         self._rank = None
         self._weights = None
+        self._epochs = None
+        self._warm_started = False
         self._fitted = False
 
     @abstractmethod
@@ -72,6 +78,17 @@ class BaseSelector(ABC):
                 raise ValueError("Given `k` should be lower than the number of selected `n_features!")
         raise Exception("This selector does not return feature ranks!")
 
+    def get_epochs(self):
+        """
+        Training epochs used by the last fit, None for selectors that are not trained in epochs.
+        """
+        self._check_fit()
+        return self._epochs
+
+    def is_warm_started(self):
+        self._check_fit()
+        return self._warm_started
+
     def get_mask(self):
         self._check_fit()
         return self._support_mask
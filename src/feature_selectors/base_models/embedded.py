@@ -15,6 +15,9 @@ class BaseEmbeddedFeatureSelector(BaseSelector):
         self._is_callable = is_callable
         self._encode = encode_classes
 
+    def _extract_weights(self):
+        return eval(f'self._model.{self._weights_attr}{"()" if self._is_callable else ""}')
+
     def fit(self, X, y, n_informative, **kwargs):
         self.check_already_fitted()
         self._X = X
@@ -23,7 +26,7 @@ class BaseEmbeddedFeatureSelector(BaseSelector):
 
         self._model.fit(X, _y, **kwargs)
 
-        weights = eval(f'self._model.{self._weights_attr}{"()" if self._is_callable else ""}')
+        weights = self._extract_weights()
 
         if len(weights.shape) > 1:
             weights = weights.sum(axis=0)
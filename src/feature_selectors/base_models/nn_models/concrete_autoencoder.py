@@ -7,6 +7,9 @@ from keras.callbacks import EarlyStopping
 from keras.initializers import Constant, glorot_normal
 from keras.optimizers import Adam
 
+from .keras_callbacks import EpochTimer
+from .keras_data import training_dataset
+
 class ConcreteSelect(Layer):
     
     def __init__(self, output_dim, start_temp = 10.0, min_temp = 0.1, alpha = 0.99999, **kwargs):
@@ -18,27 +21,25 @@ class ConcreteSelect(Layer):
         
     def build(self, input_shape):
         self.temp = self.add_weight(name = 'temp', shape = [], initializer = Constant(self.start_temp), trainable = False)
+        self.step = self.add_weight(name = 'step', shape = [], initializer = Constant(0.0), trainable = False)
         self.logits = self.add_weight(name = 'logits', shape = [self.output_dim, input_shape[1]], initializer = glorot_normal(), trainable = True)
         super(ConcreteSelect, self).build(input_shape)
         
     def call(self, X, training = None):
-        uniform = tf.random.uniform(shape=tf.shape(self.logits), minval=1e-7, maxval=1.0)
-        gumbel = -tf.math.log(-tf.math.log(uniform))
-        
-        self.temp.assign(tf.maximum(self.min_temp, self.temp * self.alpha))
-        
-        noisy_logits = (self.logits + gumbel) / self.temp
-        samples = tf.nn.softmax(noisy_logits)
-        
-        discrete_logits = tf.one_hot(tf.argmax(self.logits, axis=-1), depth=self.logits.shape[1])
-        
-        self.selections = tf.cond(
-            tf.cast(training, tf.bool),
-            lambda: samples,
-            lambda: discrete_logits
-        )
+        # `training` is a Python bool when the step is traced, so no tf.cond is needed
+        if training:
+            # the annealed temperature is a function of the step count, computed in the compiled step
+            self.step.assign_add(1.0)
+            temp = tf.maximum(self.min_temp, self.start_temp * tf.pow(self.alpha, self.step))
+            self.temp.assign(temp)
 
-        Y = tf.matmul(X, tf.transpose(self.selections))
+            uniform = tf.random.uniform(shape=tf.shape(self.logits), minval=1e-7, maxval=1.0)
+            gumbel = -tf.math.log(-tf.math.log(uniform))
+            selections = tf.nn.softmax((self.logits + gumbel) / temp)
+        else:
+            selections = tf.one_hot(tf.argmax(self.logits, axis=-1), depth=self.logits.shape[1])
+
+        Y = tf.matmul(X, tf.transpose(selections))
         return Y
     
     def compute_output_shape(self, input_shape):
@@ -60,7 +61,7 @@ class StopperCallback(EarlyStopping):
 
 class ConcreteAutoencoderFeatureSelector():
     
-    def __init__(self, K, output_function, num_epochs = 300, batch_size = None, learning_rate = 0.001, start_temp = 10.0, min_temp = 0.1, tryout_limit = 5):
+    def __init__(self, K, output_function, num_epochs = 300, batch_size = None, learning_rate = 0.001, start_temp = 10.0, min_temp = 0.1, tryout_limit = 5, tf_data = True, jit_compile = 'auto'):
         self.K = K
         self.output_function = output_function
         self.num_epochs = num_epochs
@@ -69,8 +70,10 @@ class ConcreteAutoencoderFeatureSelector():
         self.start_temp = start_temp
         self.min_temp = min_temp
         self.tryout_limit = tryout_limit
+        self.tf_data = tf_data
+        self.jit_compile = jit_compile
         
-    def fit(self, X, Y, val_X = None, val_Y = None):
+    def fit(self, X, Y, val_X = None, val_Y = None, callbacks = None):
         assert len(X) == len(Y)
         validation_data = None
         if val_X is not None and val_Y is not None:
@@ -82,6 +85,11 @@ class ConcreteAutoencoderFeatureSelector():
         
         num_epochs = self.num_epochs
         steps_per_epoch = (len(X) + self.batch_size - 1) // self.batch_size
+        self.epochs_ = 0
+        self.epoch_times_ = []
+
+        # built once and reused by every tryout
+        train_data = training_dataset(X, Y, self.batch_size) if self.tf_data else None
         
         for i in range(self.tryout_limit):
             
@@ -97,12 +105,20 @@ class ConcreteAutoencoderFeatureSelector():
 
             self.model = Model(inputs, outputs)
 
-            self.model.compile(Adam(self.learning_rate), loss = 'mean_squared_error')
+            self.model.compile(Adam(self.learning_rate), loss = 'mean_squared_error', jit_compile = self.jit_compile)
             
             stopper_callback = StopperCallback()
+            timer = EpochTimer()
+            fit_callbacks = [stopper_callback, timer] + list(callbacks or [])
             
-            hist = self.model.fit(X, Y, self.batch_size, num_epochs, verbose = 0, callbacks = [stopper_callback], validation_data = validation_data)#, validation_freq = 10)
+            if train_data is not None:
+                hist = self.model.fit(train_data, epochs = num_epochs, shuffle = False, verbose = 0, callbacks = fit_callbacks, validation_data = validation_data)
+            else:
+                hist = self.model.fit(X, Y, self.batch_size, num_epochs, verbose = 0, callbacks = fit_callbacks, validation_data = validation_data)#, validation_freq = 10)
             
+            self.epochs_ += len(hist.epoch)
+            self.epoch_times_ += timer.epoch_times
+
             mean_max_prob = tf.reduce_mean(tf.reduce_max(tf.nn.softmax(self.concrete_select.logits, axis=-1), axis=-1)).numpy()
 
             if mean_max_prob >= stopper_callback.mean_max_target:
@@ -118,6 +134,9 @@ class ConcreteAutoencoderFeatureSelector():
     def get_indices(self):
         return tf.argmax(self.model.get_layer('concrete_select').logits, axis=-1).numpy()    
     
+    def get_feature_probabilities(self):
+        return tf.reduce_max(tf.nn.softmax(self.concrete_select.logits, axis=-1), axis=0).numpy()
+
     def get_mask(self):
         return tf.reduce_sum(tf.one_hot(tf.argmax(self.model.get_layer('concrete_select').logits, axis=-1), depth=self.model.get_layer('concrete_select').logits.shape[1]), axis=0).numpy()    
     def transform(self, X):
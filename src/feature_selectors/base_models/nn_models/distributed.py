@@ -0,0 +1,114 @@
+import math
+import multiprocessing
+import multiprocessing.connection
+import os
+import tempfile
+import traceback
+
+import torch
+import torch.distributed as dist
+
+
+def is_distributed():
+    return dist.is_available() and dist.is_initialized()
+
+
+def shard(X, Y, rank, world_size, seed=0):
+    """
+    Rank's share of the samples for data-parallel training.
+
+    Every rank draws the same permutation and keeps every `world_size`-th sample of it.
+    Shards are truncated to equal length (dropping fewer than `world_size` samples), so all
+    ranks run the same number of steps per epoch and no collective is left waiting.
+    """
+    n_samples = len(X) - len(X) % world_size
+    order = torch.randperm(len(X), generator=torch.Generator().manual_seed(seed))[:n_samples]
+    idx = order[rank::world_size].to(X.device)
+    return X[idx], Y[idx]
+
+
+def local_batch_size(batch_size, world_size):
+    # the global batch keeps its size, split across the ranks
+    return max(1, math.ceil(batch_size / world_size))
+
+
+def sync_gradients(parameters, world_size):
+    """
+    Averages the gradients of `parameters` over all ranks with a single all-reduce.
+    """
+    grads = [p.grad for p in parameters if p.grad is not None]
+    if not grads:
+        return
+    flat = torch.cat([g.reshape(-1) for g in grads])
+    dist.all_reduce(flat)
+    flat /= world_size
+    offset = 0
+    for g in grads:
+        g.copy_(flat[offset:offset + g.numel()].view_as(g))
+        offset += g.numel()
+
+
+def average(tensor):
+    """
+    Mean of `tensor` over all ranks, e.g. the epoch loss read by a scheduler.
+    """
+    tensor = tensor.clone()
+    dist.all_reduce(tensor)
+    return tensor / dist.get_world_size()
+
+
+def _entry(rank, world_size, init_file, worker, n_threads, result_path):
+    try:
+        torch.set_num_threads(n_threads)
+        dist.init_process_group('gloo', init_method=f'file://{init_file}', rank=rank, world_size=world_size)
+        result = worker(rank, world_size)
+        if rank == 0:
+            torch.save(result, result_path)
+        dist.barrier()
+    except Exception:
+        traceback.print_exc()
+        os._exit(1)
+    finally:
+        if is_distributed():
+            dist.destroy_process_group()
+
+
+def run_data_parallel(worker, n_procs, n_threads=None):
+    """
+    Runs `worker(rank, world_size)` on `n_procs` local CPU processes joined in a gloo
+    process group, and returns what rank 0 returned.
+
+    Processes are forked, so `worker` can be a closure over the model, data and loss
+    callbacks of the caller; each process trains its own copy and only rank 0's result
+    (e.g. its state dict) comes back. Forking requires the caller not to be a daemonic
+    process, i.e. not a `multiprocessing.Pool` worker.
+    """
+    if n_threads is None:
+        n_threads = max(1, torch.get_num_threads() // n_procs)
+
+    context = multiprocessing.get_context('fork')
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        init_file = os.path.join(tmp_dir, 'init')
+        result_path = os.path.join(tmp_dir, 'result.pt')
+
+        processes = [
+            context.Process(target=_entry, args=(rank, n_procs, init_file, worker, n_threads, result_path))
+            for rank in range(n_procs)
+        ]
+        for process in processes:
+            process.start()
+
+        running = {process.sentinel: process for process in processes}
+        while running:
+            for sentinel in multiprocessing.connection.wait(list(running)):
+                process = running.pop(sentinel)
+                process.join()
+                if process.exitcode != 0:
+                    # the other ranks would block forever in their next collective
+                    for other in running.values():
+                        other.terminate()
+
+        failed = [rank for rank, process in enumerate(processes) if process.exitcode != 0]
+        if failed:
+            raise RuntimeError(f"Data-parallel training failed on ranks {failed}!")
+        return torch.load(result_path, weights_only=False)
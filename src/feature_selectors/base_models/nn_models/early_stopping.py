@@ -0,0 +1,85 @@
+import numpy as np
+from scipy.stats import spearmanr
+
+
+class RankingConvergence:
+    """
+    Stops training once the feature ranking produced by the model stops changing.
+
+    Every `check_every` epochs the importance vector is extracted and compared with the
+    one from the previous check. A check is stable when the top-`top_k` feature set is
+    unchanged and/or the Spearman correlation between both vectors is at least
+    `min_correlation` (whichever criteria are set must all hold). Training stops after
+    `patience` consecutive stable checks, and never before `min_epochs`.
+    """
+
+    def __init__(self, importance_fn=None, check_every=10, patience=3, top_k=None, min_correlation=None, min_epochs=0):
+        if top_k is None and min_correlation is None:
+            raise ValueError("At least one of top_k or min_correlation must be set!")
+        self.importance_fn = importance_fn
+        self.check_every = check_every
+        self.patience = patience
+        self.top_k = top_k
+        self.min_correlation = min_correlation
+        self.min_epochs = min_epochs
+        self.reset()
+
+    def reset(self):
+        self._previous = None
+        self._stable_checks = 0
+        self.stopped_epoch = None
+
+    def _is_stable(self, previous, current):
+        if self.top_k is not None:
+            k = min(self.top_k, len(current))
+            if set(np.argsort(previous)[::-1][:k]) != set(np.argsort(current)[::-1][:k]):
+                return False
+
+        if self.min_correlation is not None:
+            correlation = spearmanr(previous, current).statistic
+            # a constant importance vector has no defined correlation
+            if not correlation >= self.min_correlation:
+                return False
+
+        return True
+
+    def update(self, epoch, weights):
+        """
+        Records the importance vector after `epoch` completed epochs, returns True to stop.
+        """
+        if epoch % self.check_every != 0:
+            return False
+
+        weights = np.asarray(weights, dtype=float).ravel()
+        if self._previous is not None and self._is_stable(self._previous, weights):
+            self._stable_checks += 1
+        else:
+            self._stable_checks = 0
+        self._previous = weights
+
+        if self._stable_checks >= self.patience and epoch >= self.min_epochs:
+            self.stopped_epoch = epoch
+            return True
+        return False
+
+    def __call__(self, epoch):
+        # the importance vector is only extracted on check epochs
+        if epoch % self.check_every != 0:
+            return False
+        return self.update(epoch, self.importance_fn())
+
+
+def ranking_convergence(early_stopping, importance_fn=None, top_k=None):
+    """
+    Builds the criterion from a selector's `early_stopping` parameter.
+
+    `early_stopping` is either falsy (disabled), True (defaults) or a dict of
+    `RankingConvergence` arguments; `top_k` is used when the dict sets no criterion.
+    """
+    if not early_stopping:
+        return None
+
+    params = dict(early_stopping) if isinstance(early_stopping, dict) else {}
+    if params.get('top_k') is None and params.get('min_correlation') is None:
+        params['top_k'] = top_k
+    return RankingConvergence(importance_fn, **params)
@@ -0,0 +1,102 @@
+import random
+import sys
+from contextlib import contextmanager
+from time import perf_counter
+
+import numpy as np
+import torch
+import torch.distributed as dist
+
+from .distributed import average, is_distributed, sync_gradients
+
+
+def seed_everything(seed):
+    """
+    Seeds python, numpy and torch, and the Keras backend when Keras is already loaded.
+    Must be called before the model is built so its initialization is reproducible.
+    """
+    if seed is None:
+        return
+    random.seed(seed)
+    np.random.seed(seed)
+    torch.manual_seed(seed)
+    # never import Keras just to seed it
+    if 'keras' in sys.modules:
+        sys.modules['keras'].utils.set_random_seed(seed)
+
+
+@contextmanager
+def num_threads(n_threads):
+    """
+    Limits the torch intra-op thread pool for the duration of the block.
+    """
+    if n_threads is None:
+        yield
+        return
+
+    previous = torch.get_num_threads()
+    torch.set_num_threads(n_threads)
+    try:
+        yield
+    finally:
+        torch.set_num_threads(previous)
+
+
+class TrainingEngine:
+    """
+    Epoch loop shared by the torch based selectors.
+
+    The engine owns what is common to every selector: iterating the batches, the
+    optimizer step, the thread budget, early stopping and timing. A selector plugs in
+    its `loss_fn(x, y)` and, when needed, `on_epoch_begin(epoch)` and
+    `on_epoch_end(epoch, loss)` hooks; `loss` is the summed epoch loss, still on device.
+    `batches` is any re-iterable of `(x, y)` pairs, e.g. `TensorBatches`.
+
+    Inside a data-parallel process group (see `distributed.run_data_parallel`) each rank
+    iterates its own shard; gradients are averaged over the ranks before every optimizer
+    step and the epoch loss before `on_epoch_end`, so all ranks stay identical.
+
+    After `fit`, `epochs_` holds the epochs actually trained, `epoch_times_` the wall
+    time of each epoch and `fit_time_` the total.
+    """
+
+    def __init__(self, epochs=200, early_stopping=None, n_threads=None):
+        self.epochs = epochs
+        self.early_stopping = early_stopping
+        self.n_threads = n_threads
+
+    def fit(self, loss_fn, optimizer, batches, on_epoch_begin=None, on_epoch_end=None):
+        self.epochs_ = self.epochs
+        self.epoch_times_ = []
+        start = perf_counter()
+
+        world_size = dist.get_world_size() if is_distributed() else 1
+        parameters = [p for group in optimizer.param_groups for p in group['params']]
+
+        with num_threads(self.n_threads):
+            for epoch in range(self.epochs):
+                epoch_start = perf_counter()
+                if on_epoch_begin is not None:
+                    on_epoch_begin(epoch)
+
+                total_loss = None
+                for x, y in batches:
+                    optimizer.zero_grad(set_to_none=True)
+                    loss = loss_fn(x, y)
+                    loss.backward()
+                    if world_size > 1:
+                        sync_gradients(parameters, world_size)
+                    optimizer.step()
+                    # accumulated on device, no host sync per step
+                    total_loss = loss.detach() if total_loss is None else total_loss + loss.detach()
+
+                if on_epoch_end is not None:
+                    on_epoch_end(epoch, average(total_loss) if world_size > 1 else total_loss)
+                self.epoch_times_.append(perf_counter() - epoch_start)
+
+                if self.early_stopping is not None and self.early_stopping(epoch + 1):
+                    self.epochs_ = epoch + 1
+                    break
+
+        self.fit_time_ = perf_counter() - start
+        return self
@@ -1,7 +1,9 @@
 import numpy as np
 import torch
 
-from .utils import TrainingSet
+from .distributed import local_batch_size, run_data_parallel, shard
+from .engine import TrainingEngine
+from .utils import TensorBatches
 
 
 def init_weights(m):
@@ -67,8 +69,9 @@ class Selector(torch.nn.Module):
     def init(self, U):
         self.weight_predictor.init(U)
 
-    def forward(self, X, check_nan = False):
-        logits = self.compute_logits()
+    def forward(self, X, check_nan = False, logits = None):
+        if logits is None:
+            logits = self.compute_logits()
         if check_nan:
             assert not torch.isnan(logits).any()
 
@@ -170,8 +173,9 @@ class Reconstruction(torch.nn.Module):
     def init(self, U):
         self.weight_predictor.init(U)
 
-    def forward(self, X):
-        weights = self.weight_predictor()
+    def forward(self, X, weights=None):
+        if weights is None:
+            weights = self.weight_predictor()
         return torch.mm(X, weights)
 
 
@@ -189,17 +193,69 @@ class FSNet(torch.nn.Module):
         self.decoder = Decoder(n_selected, n_selected)
         self.reconstruction = Reconstruction(n_selected, n_bins, n_input)
 
-    def fit(self, X, y, n_epochs=500, batch_size=64, _lambda=10, weight_decay=1e-6):
-        device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    def fit(
+            self,
+            X,
+            y,
+            n_epochs=500,
+            batch_size=64,
+            _lambda=10,
+            weight_decay=1e-6,
+            check_nan_every=10,
+            full_batch_threshold=None,
+            reuse_buffers=False,
+            early_stopping=None,
+            n_threads=None,
+            n_procs=None
+    ):
+        data_parallel = n_procs is not None and n_procs > 1
+        device = torch.device('cuda' if torch.cuda.is_available() and not data_parallel else 'cpu')
         self.to(device)
         # Initialize weight predictors
         U = FSNet.compute_u(X, n_bins=self.n_bins, device=device)
         self.selector.init(U)
         self.reconstruction.init(U.t())
 
-        dataset = TrainingSet(X, y, device)
-        loader = torch.utils.data.DataLoader(
-            dataset, batch_size=batch_size, shuffle=True, sampler=None, num_workers=0)
+        if data_parallel:
+            # CPU data parallelism: the histogram basis comes from all samples, every rank trains on a shard
+            X, y = X.cpu(), y.cpu()
+
+            def worker(rank, world_size):
+                X_shard, y_shard = shard(X, y, rank, world_size)
+                self._train(
+                    X_shard, y_shard, device, n_epochs, local_batch_size(batch_size, world_size), _lambda,
+                    weight_decay, check_nan_every, full_batch_threshold, reuse_buffers, early_stopping, None)
+                return {name: value.detach().cpu() for name, value in self.state_dict().items()}, self.epochs_
+
+            state, self.epochs_ = run_data_parallel(worker, n_procs, n_threads)
+            self.load_state_dict(state)
+            self.model.eval()
+            return
+
+        self._train(
+            X, y, device, n_epochs, batch_size, _lambda, weight_decay, check_nan_every,
+            full_batch_threshold, reuse_buffers, early_stopping, n_threads)
+
+    def _train(
+            self,
+            X,
+            y,
+            device,
+            n_epochs,
+            batch_size,
+            _lambda,
+            weight_decay,
+            check_nan_every,
+            full_batch_threshold,
+            reuse_buffers,
+            early_stopping,
+            n_threads
+    ):
+        X = X.to(device=device, dtype=torch.float32)
+        y = y.to(device=device, dtype=torch.long)
+        loader = TensorBatches(
+            X, y, batch_size=batch_size, shuffle=True,
+            full_batch_threshold=full_batch_threshold, reuse_buffers=reuse_buffers)
         self.model.train()
         if self.n_classes <= 2:
             criterion = torch.nn.BCEWithLogitsLoss(reduction='mean')
@@ -210,54 +266,53 @@ class FSNet(torch.nn.Module):
             optimizer, mode='min', factor=0.9, patience=10, threshold=0.0001,
             threshold_mode='rel', cooldown=5, min_lr=1e-5, eps=1e-08)
 
-        for e in range(n_epochs):
+        state = {'check_nan': False}
+
+        def on_epoch_begin(e):
             # Lower the temperature
             self.selector.update_temperature(e, n_epochs)
 
-            check_nan = (e % 10 == 0)
-
-            total_loss = 0
-            for _X, _y in loader:
-                _X = _X.to(device).contiguous()
-                _y = _y.to(device)
-
-                optimizer.zero_grad()
-
-                # Select a subset of features
-                X_subset = self.selector.forward(_X, check_nan=check_nan)
-                if check_nan:
-                    assert not torch.isnan(X_subset).any()
-
-                # Predict the target variable from the selected subset of features
-                X_latent = self.encoder.forward(X_subset)
-                if check_nan:
-                    assert not torch.isnan(X_latent).any()
-                y_hat = self.model.forward(X_latent)
-                if check_nan:
-                    assert not torch.isnan(X_latent).any()
-
-                # Reconstruct the input data
-                X_reconstructed = self.decoder.forward(X_latent)
-                if check_nan:
-                    assert not torch.isnan(y_hat).any()
-                X_reconstructed = self.reconstruction.forward(X_reconstructed)
-                if check_nan:
-                    assert not torch.isnan(X_reconstructed).any()
-
-                # Compute loss function
-                if self.n_classes > 2:
-                    loss1 = criterion(y_hat, _y)
-                else:
-                    loss1 = criterion(torch.squeeze(y_hat), torch.squeeze(_y.float()))
-                loss2 = _lambda * torch.mean((_X - X_reconstructed) ** 2)
-                loss = loss1 + loss2
-
-                total_loss += loss.item()
-
-                # Update parameters
-                loss.backward()
-                optimizer.step()
-            scheduler.step(total_loss)
+            # NaN checks force a host sync per tensor, so they only run every `check_nan_every`
+            # epochs; 0 turns them off
+            state['check_nan'] = bool(check_nan_every) and e % check_nan_every == 0
+
+        def loss_fn(_X, _y):
+            check_nan = state['check_nan']
+
+            # Predict the selection and reconstruction matrices once per optimizer step
+            logits = self.selector.compute_logits()
+            reconstruction_weights = self.reconstruction.weight_predictor()
+
+            # Select a subset of features
+            X_subset = self.selector.forward(_X, check_nan=check_nan, logits=logits)
+
+            # Predict the target variable from the selected subset of features
+            X_latent = self.encoder.forward(X_subset)
+            y_hat = self.model.forward(X_latent)
+
+            # Reconstruct the input data
+            X_reconstructed = self.decoder.forward(X_latent)
+            X_reconstructed = self.reconstruction.forward(X_reconstructed, weights=reconstruction_weights)
+
+            if check_nan:
+                for tensor in (X_latent, y_hat, X_reconstructed):
+                    assert not torch.isnan(tensor).any()
+
+            # Compute loss function
+            if self.n_classes > 2:
+                loss1 = criterion(y_hat, _y)
+            else:
+                loss1 = criterion(torch.squeeze(y_hat), torch.squeeze(_y.float()))
+            loss2 = _lambda * torch.mean((_X - X_reconstructed) ** 2)
+            return loss1 + loss2
+
+        def on_epoch_end(e, total_loss):
+            # the epoch loss is read back once, for the scheduler
+            scheduler.step(total_loss.item())
+
+        self.engine = TrainingEngine(n_epochs, early_stopping=early_stopping, n_threads=n_threads)
+        self.engine.fit(loss_fn, optimizer, loader, on_epoch_begin=on_epoch_begin, on_epoch_end=on_epoch_end)
+        self.epochs_ = self.engine.epochs_
 
         self.model.eval()
 
@@ -281,11 +336,36 @@ class FSNet(torch.nn.Module):
 
     @staticmethod
     def compute_u(X, n_bins=20, device='cpu'):
-        n_features = X.shape[1]
-        U = np.zeros((n_features, n_bins),dtype=float)
-        for j in range(0, n_features):
-            hist = np.histogram(X[:, j].cpu().numpy(), n_bins)
-            U[j, :] = 0.5 * hist[0][:] * (hist[1][:-1] + hist[1][1:])
+        """
+        Histogram basis of every feature, `0.5 * count * (left_edge + right_edge)` per bin.
+        All columns are binned in one vectorized pass that reproduces `np.histogram`.
+        """
+        X = X.detach().cpu().numpy() if torch.is_tensor(X) else np.asarray(X)
+        X = X.astype(X.dtype if np.issubdtype(X.dtype, np.floating) else np.float64, copy=False)
+        dtype = X.dtype
+        n_samples, n_features = X.shape
+
+        first_edge = X.min(axis=0)
+        last_edge = X.max(axis=0)
+        constant = first_edge == last_edge
+        first_edge[constant] -= 0.5
+        last_edge[constant] += 0.5
+
+        bin_edges = np.linspace(first_edge, last_edge, n_bins + 1, axis=1, dtype=dtype)
+
+        indices = ((X - first_edge) / (last_edge - first_edge) * n_bins).astype(np.intp)
+        indices[indices == n_bins] -= 1
+
+        # same ~1 ULP corrections as np.histogram, the last bin includes the right edge
+        edges_t = bin_edges.T
+        indices[X < np.take_along_axis(edges_t, indices, axis=0)] -= 1
+        increment = (X >= np.take_along_axis(edges_t, indices + 1, axis=0)) & (indices != n_bins - 1)
+        indices[increment] += 1
+
+        flat_indices = (indices + np.arange(n_features) * n_bins).ravel()
+        counts = np.bincount(flat_indices, minlength=n_features * n_bins).reshape(n_features, n_bins)
+
+        U = 0.5 * counts * (bin_edges[:, :-1] + bin_edges[:, 1:])
         U -= U.mean()
         U /= U.std()
-        return torch.tensor(U, dtype=torch.float32, device=device)
\ No newline at end of file
+        return torch.tensor(U, dtype=torch.float32, device=device)
@@ -0,0 +1,35 @@
+from time import perf_counter
+
+from keras.callbacks import Callback
+
+
+class RankingConvergenceCallback(Callback):
+    """
+    Keras adapter for `RankingConvergence`: stops `model.fit` once the ranking settles.
+    """
+
+    def __init__(self, criterion):
+        super().__init__()
+        self.criterion = criterion
+
+    def on_train_begin(self, logs=None):
+        self.criterion.reset()
+
+    def on_epoch_end(self, epoch, logs=None):
+        if self.criterion(epoch + 1):
+            self.model.stop_training = True
+
+
+class EpochTimer(Callback):
+    """
+    Records the wall time of every epoch in `epoch_times`.
+    """
+
+    def on_train_begin(self, logs=None):
+        self.epoch_times = []
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._start = perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        self.epoch_times.append(perf_counter() - self._start)
@@ -0,0 +1,18 @@
+import numpy as np
+import tensorflow as tf
+
+
+def training_dataset(X, y, batch_size, shuffle=True):
+    """
+    Cached, shuffled and prefetched `tf.data` pipeline over in-memory arrays.
+
+    The arrays are converted to float32 once and cached, so every epoch only reshuffles
+    and slices them while the next batch is prepared in the background.
+    """
+    X = np.asarray(X, dtype=np.float32)
+    y = np.asarray(y, dtype=np.float32)
+
+    dataset = tf.data.Dataset.from_tensor_slices((X, y)).cache()
+    if shuffle:
+        dataset = dataset.shuffle(len(X), reshuffle_each_iteration=True)
+    return dataset.batch(batch_size).prefetch(tf.data.AUTOTUNE)
@@ -0,0 +1,233 @@
+from collections import OrderedDict
+import hashlib
+import os
+import pickle
+
+import numpy as np
+import scipy
+
+
+class GaussianKnockoffs:
+    """
+    Gaussian knockoffs built from the dense F x F empirical covariance.
+
+    `fit` computes the deterministic part of the construction, `sample` only draws the
+    Gaussian noise, so the same factors can be reused for several knockoff draws.
+    """
+
+    def __init__(self, eps=1e-3, lambda_=0.7):
+        self.eps = eps
+        self.lambda_ = lambda_
+
+    def fit(self, X):
+        # Compute mean and empirical variance
+        mu = np.mean(X, axis=0)
+        sigma = np.cov(X, rowvar=False)
+
+        # Regularize covariance for stability
+        sigma_reg = self.lambda_ * np.diag(np.diagonal(sigma)) + (1. - self.lambda_) * sigma
+
+        # Compute diagonal s matrix for knockoffs
+        S = np.diag(np.diagonal(sigma_reg))
+
+        # Compute matrix for knockoff covariance
+        sigma_inv_S = scipy.linalg.lstsq(sigma_reg, S)[0]
+        V = 2. * S - np.dot(S, sigma_inv_S)
+        L = np.linalg.cholesky(V + self.eps * np.eye(X.shape[1]))
+
+        self.mu_ = mu
+        self.sigma_inv_S_ = sigma_inv_S
+        self.L_ = L
+        return self
+
+    def _conditional_mean(self, X):
+        return X - (X - np.broadcast_to(self.mu_, X.shape)) @ self.sigma_inv_S_
+
+    def _noise(self, n_samples):
+        return np.random.normal(size=(n_samples, self.L_.shape[0])) @ self.L_.T
+
+    def sample(self, X):
+        X_knock = self._conditional_mean(X) + self._noise(X.shape[0])
+        return np.stack([X, X_knock], axis=2)
+
+    def generate(self, X):
+        return self.fit(X).sample(X)
+
+    def cache_params(self):
+        return {'eps': self.eps, 'lambda_': self.lambda_}
+
+
+class LowRankGaussianKnockoffs(GaussianKnockoffs):
+    """
+    Same knockoff distribution as `GaussianKnockoffs`, computed in the sample space.
+
+    With n samples the regularized covariance is diagonal plus rank n, so its inverse follows
+    from the Woodbury identity through an n x n system and the knockoff covariance is again
+    diagonal plus rank n. Memory is O(nF) and time O(n^2 F) instead of O(F^2) and O(F^3).
+    Requires `lambda_ > 0.5`, otherwise the diagonal part of the knockoff covariance is not
+    positive.
+    """
+
+    def fit(self, X):
+        if self.lambda_ <= 0.5:
+            raise ValueError(f"Low rank knockoffs require `lambda_` > 0.5, got {self.lambda_}")
+
+        n_samples = X.shape[0]
+        lambda_ = self.lambda_
+
+        mu = np.mean(X, axis=0)
+        X_centered = X - mu
+        d = np.var(X, axis=0, ddof=1)
+
+        # sigma_reg = A + U^T U with A = lambda * diag(sigma)
+        U = np.sqrt((1. - lambda_) / (n_samples - 1)) * X_centered
+        a_inv = np.divide(1., lambda_ * d, out=np.zeros_like(d), where=d > 0)
+
+        # C = I + U A^-1 U^T is the n x n system of the Woodbury identity
+        C = np.eye(n_samples) + (U * a_inv) @ U.T
+        C_chol = scipy.linalg.cho_factor(C, lower=True)
+
+        self.mu_ = mu
+        self.U_ = U
+        self.a_inv_ = a_inv
+        self.C_chol_ = C_chol
+
+        # knockoff covariance V + eps * I = E + W^T W
+        self.E_sqrt_ = np.sqrt((2. - 1. / lambda_) * d + self.eps)
+        self.W_ = scipy.linalg.solve_triangular(C_chol[0], U, lower=True) / lambda_
+        return self
+
+    def _conditional_mean(self, X):
+        # (X - mu) @ sigma_reg^-1 S = ((X - mu) - (X - mu) A^-1 U^T C^-1 U) / lambda
+        X_centered = X - self.mu_
+        low_rank = scipy.linalg.cho_solve(self.C_chol_, (self.U_ * self.a_inv_) @ X_centered.T, check_finite=False).T
+        return X - (X_centered - low_rank @ self.U_) / self.lambda_
+
+    def _noise(self, n_samples):
+        n_features = self.E_sqrt_.shape[0]
+        diagonal = np.random.normal(size=(n_samples, n_features)) * self.E_sqrt_
+        low_rank = np.random.normal(size=(n_samples, self.W_.shape[0])) @ self.W_
+        return diagonal + low_rank
+
+
+class BlockGaussianKnockoffs(GaussianKnockoffs):
+    """
+    Gaussian knockoffs from a block-diagonal covariance estimate over contiguous feature
+    blocks of at most `block_size` features. Memory is O(F * block_size).
+    """
+
+    def __init__(self, eps=1e-3, lambda_=0.7, block_size=500):
+        super().__init__(eps=eps, lambda_=lambda_)
+        self.block_size = block_size
+
+    def cache_params(self):
+        return {**super().cache_params(), 'block_size': self.block_size}
+
+    def fit(self, X):
+        n_features = X.shape[1]
+        self.blocks_ = [
+            (start, GaussianKnockoffs(self.eps, self.lambda_).fit(X[:, start:start + self.block_size]))
+            for start in range(0, n_features, self.block_size)
+        ]
+        return self
+
+    def _conditional_mean(self, X):
+        return np.hstack([
+            block._conditional_mean(X[:, start:start + self.block_size])
+            for start, block in self.blocks_
+        ])
+
+    def _noise(self, n_samples):
+        return np.hstack([block._noise(n_samples) for _, block in self.blocks_])
+
+
+def knockoff_generator(method, n_samples, n_features, block_size=500, **kwargs):
+    """
+    Returns the knockoff generator for `method` in {'dense', 'lowrank', 'block', 'auto'}.
+    'auto' works in the sample space whenever there are fewer samples than features.
+    """
+    if method == 'auto':
+        method = 'lowrank' if n_samples < n_features else 'dense'
+
+    if method == 'dense':
+        return GaussianKnockoffs(**kwargs)
+    if method == 'lowrank':
+        return LowRankGaussianKnockoffs(**kwargs)
+    if method == 'block':
+        return BlockGaussianKnockoffs(block_size=block_size, **kwargs)
+
+    raise ValueError(f"Unknown knockoff method: {method}")
+
+
+class KnockoffFactorsCache:
+    """
+    Caches fitted knockoff generators, i.e. the deterministic part of the construction,
+    keyed by a fingerprint of the data, the preprocessing variant and the generator.
+
+    Fitted generators are kept in a small per-process LRU and, when `cache_dir` is given,
+    also pickled to disk so that worker processes working on the same data share them.
+    Only the Gaussian draw of `sample` is then paid for on a hit. Task processes are
+    fresh, so across tasks only the disk cache hits; selection runs set its
+    `default_cache_dir` (see `task.worker_setup`).
+    """
+
+    _memory = OrderedDict()
+    MEMORY_SIZE = 4
+    # used when no `cache_dir` is given
+    default_cache_dir = None
+
+    def __init__(self, cache_dir=None):
+        self._cache_dir = cache_dir if cache_dir is not None else self.default_cache_dir
+
+    @staticmethod
+    def fingerprint(X, generator, variant=''):
+        X = np.ascontiguousarray(X)
+        digest = hashlib.sha1()
+        digest.update(X.data)
+        digest.update(repr((X.shape, str(X.dtype), variant, type(generator).__name__)).encode())
+        digest.update(repr(sorted(generator.cache_params().items())).encode())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self._cache_dir, f'{key}.pkl')
+
+    def _load(self, key):
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+
+        if self._cache_dir is not None and os.path.exists(self._path(key)):
+            try:
+                with open(self._path(key), 'rb') as f:
+                    return pickle.load(f)
+            except Exception:
+                return None
+        return None
+
+    def _store_memory(self, key, generator):
+        self._memory[key] = generator
+        while len(self._memory) > self.MEMORY_SIZE:
+            self._memory.popitem(last=False)
+
+    def _store(self, key, generator):
+        self._store_memory(key, generator)
+
+        if self._cache_dir is not None:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            # write to a process-unique file first so readers never see partial pickles
+            tmp_path = f'{self._path(key)}.{os.getpid()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(generator, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+
+    def fit(self, generator, X, variant=''):
+        key = self.fingerprint(X, generator, variant)
+        cached = self._load(key)
+        if cached is not None:
+            if key not in self._memory:
+                self._store_memory(key, cached)
+            return cached
+
+        generator.fit(X)
+        self._store(key, generator)
+        return generator
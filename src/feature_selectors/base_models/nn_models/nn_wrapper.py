@@ -2,10 +2,11 @@ import captum.attr
 import numpy as np
 import torch
 from sklearn.model_selection import train_test_split
-from torch.utils.data import DataLoader
 
 from .cancelout import CancelOut
-from .utils import TrainingSet, TestSet
+from .distributed import local_batch_size, run_data_parallel, shard
+from .engine import TrainingEngine
+from .utils import TensorBatches, TestSet
 
 def init_weights(m):
     if isinstance(m, torch.nn.Linear):
@@ -42,10 +43,10 @@ class Model(torch.nn.Module):
 
 class ModelWithCancelOut(torch.nn.Module):
 
-    def __init__(self, input_size, n_classes, hidden_dims = None, cancel_out_activation='sigmoid'):
+    def __init__(self, input_size, n_classes, hidden_dims = None, cancel_out_activation='sigmoid', dropout=0.04308691548552568):
         torch.nn.Module.__init__(self)
         self.cancel_out = CancelOut(input_size, activation=cancel_out_activation)
-        self.model = Model(input_size, n_classes, hidden_dims = hidden_dims)
+        self.model = Model(input_size, n_classes, hidden_dims = hidden_dims, dropout=dropout)
 
     def forward(self, x):
         x = self.cancel_out(x)
@@ -71,29 +72,51 @@ class NNwrapper:
             learning_rate=1e-3,
             epochs=200,  
             batch_size=64,  # 64
-            weight_decay=1e-5  # 1e-5
+            weight_decay=1e-5,  # 1e-5
+            full_batch_threshold=None,
+            reuse_buffers=False,
+            early_stopping=None,
+            n_threads=None,
+            n_procs=None
     ):
+        if n_procs is not None and n_procs > 1:
+            # CPU data parallelism: every rank trains its copy on a shard of the samples
+            def worker(rank, world_size):
+                X_shard, Y_shard = shard(X, Y, rank, world_size)
+                self.fit(
+                    X_shard, Y_shard, 'cpu', learning_rate, epochs, local_batch_size(batch_size, world_size),
+                    weight_decay, full_batch_threshold, reuse_buffers, early_stopping)
+                return {name: value.detach().cpu() for name, value in self.model.state_dict().items()}, self.epochs_
+
+            state, self.epochs_ = run_data_parallel(worker, n_procs, n_threads)
+            self.model.to('cpu').load_state_dict(state)
+            self.model.eval()
+            self.trained = True
+            return
+
         self.model.to(device)
 
-        # Create dataloader for all samples
-        train_loader = DataLoader(TrainingSet(X, Y, device),batch_size=batch_size, shuffle=True)
+        # Batches are sliced straight from the resident tensors
+        X = X.to(device=device, dtype=torch.float32)
+        Y = Y.to(device=device, dtype=torch.float32 if self.n_classes <= 2 else torch.long)
+        train_loader = TensorBatches(
+            X, Y, batch_size=batch_size, shuffle=True,
+            full_batch_threshold=full_batch_threshold, reuse_buffers=reuse_buffers)
         criterion = torch.nn.BCEWithLogitsLoss() if self.n_classes <= 2 else torch.nn.CrossEntropyLoss()
         optimizer = torch.optim.Adam(self.model.parameters(), lr=learning_rate, weight_decay=weight_decay)
 
+        def loss_fn(x, y):
+            y_hat = self.model(x)
+            if self.n_classes <= 2:
+                y_hat = y_hat.squeeze()
+            loss = criterion(y_hat, y)
+            for cb in self.loss_callbacks:
+                loss += cb()
+            return loss
+
         self.model.train()
-        for epoch in range(epochs):
-            for x, y in train_loader:
-                x = x.to(device)
-                y = y.to(device)
-                optimizer.zero_grad()
-                y_hat = self.model(x)
-                if self.n_classes <= 2:
-                    y_hat = y_hat.squeeze()
-                    y = y.float()
-                loss = criterion(y_hat, y)
-                for cb in self.loss_callbacks:
-                    loss += cb()
-                loss.backward()
-                optimizer.step()
+        self.engine = TrainingEngine(epochs, early_stopping=early_stopping, n_threads=n_threads)
+        self.engine.fit(loss_fn, optimizer, train_loader)
+        self.epochs_ = self.engine.epochs_
         self.model.eval()
-        self.trained = True
\ No newline at end of file
+        self.trained = True
@@ -0,0 +1,108 @@
+import copy
+
+import torch
+from torch.func import functional_call, stack_module_state, vmap
+
+from .engine import TrainingEngine
+from .utils import ReplicateBatches
+
+
+class ReplicateTrainer:
+    """
+    Trains R independent copies of the same architecture in a single loop.
+
+    The parameters of the R models are stacked along a leading replicate dimension and
+    the forward pass is vectorized with `torch.func.vmap`, so every optimizer step runs
+    R small models as a few batched matmuls. Each replicate keeps its own initialization
+    and its own training data (`X` and `Y` carry the replicate dimension first), and Adam
+    being element-wise, the stacked update is the same as R separate optimizers.
+
+    Loss callbacks receive the parameters of one replicate as a dict and return a scalar.
+
+    `early_stopping` takes one `RankingConvergence` per replicate, fed on its check epochs
+    with `importance_fn(model)` of that replicate; training stops once every replicate
+    has converged, the ones that converged first keep training until then.
+    """
+
+    def __init__(self, models, n_classes):
+        self.models = models
+        self.n_classes = n_classes
+        self.loss_callbacks = []
+        self.trained = False
+
+    def add_loss_callback(self, func):
+        self.loss_callbacks.append(func)
+
+    def _loss(self, params, buffers, x, y):
+        y_hat = functional_call(self._base_model, (params, buffers), (x,))
+        if self.n_classes <= 2:
+            y_hat = y_hat.squeeze(-1)
+        loss = self._criterion(y_hat, y)
+        for cb in self.loss_callbacks:
+            loss = loss + cb(params)
+        return loss
+
+    def _load_models(self, params, buffers):
+        with torch.no_grad():
+            for r, model in enumerate(self.models):
+                model.load_state_dict({name: value[r] for name, value in {**params, **buffers}.items()})
+
+    def fit(
+            self,
+            X,
+            Y,
+            device='cpu',
+            learning_rate=1e-3,
+            epochs=200,
+            batch_size=64,
+            weight_decay=1e-5,
+            full_batch_threshold=None,
+            early_stopping=None,
+            importance_fn=None,
+            n_threads=None
+    ):
+        n_replicates, n_samples = Y.shape[:2]
+        assert n_replicates == len(self.models) and X.shape[:2] == Y.shape[:2]
+
+        for model in self.models:
+            model.to(device).train()
+
+        X = X.to(device=device, dtype=torch.float32)
+        Y = Y.to(device=device, dtype=torch.float32 if self.n_classes <= 2 else torch.long)
+
+        params, buffers = stack_module_state(self.models)
+        self._base_model = copy.deepcopy(self.models[0]).to('meta')
+        self._criterion = torch.nn.BCEWithLogitsLoss() if self.n_classes <= 2 else torch.nn.CrossEntropyLoss()
+        optimizer = torch.optim.Adam(params.values(), lr=learning_rate, weight_decay=weight_decay)
+
+        # dropout masks differ between replicates
+        batched_loss = vmap(self._loss, randomness='different')
+
+        def loss_fn(x, y):
+            # replicates share no parameters, so the summed loss gives each its own gradient
+            return batched_loss(params, buffers, x, y).sum()
+
+        converged = set()
+
+        def all_converged(epoch):
+            # the stacked state is only copied back into the models on check epochs
+            if epoch % early_stopping[0].check_every != 0:
+                return False
+            self._load_models(params, buffers)
+            for r, (criterion, model) in enumerate(zip(early_stopping, self.models)):
+                if criterion.update(epoch, importance_fn(model)):
+                    converged.add(r)
+            return len(converged) == len(self.models)
+
+        self.engine = TrainingEngine(epochs, early_stopping=all_converged if early_stopping else None, n_threads=n_threads)
+        self.engine.fit(
+            loss_fn, optimizer, ReplicateBatches(X, Y, batch_size=batch_size, full_batch_threshold=full_batch_threshold)
+        )
+
+        self._load_models(params, buffers)
+        for model in self.models:
+            model.eval()
+
+        self.epochs_ = self.engine.epochs_
+        self.trained = True
+        return self.models
@@ -24,4 +24,107 @@ class TestSet(torch.utils.data.Dataset):
         return len(self.X)
 
     def __getitem__(self, idx):
-        return self.X[idx]
\ No newline at end of file
+        return self.X[idx]
+
+class TensorBatches:
+    """
+    Mini-batch iterator over tensors that are already resident in memory.
+
+    Each epoch draws one permutation and slices it, instead of going through a
+    `DataLoader` that indexes and collates every sample separately. Datasets with at
+    most `full_batch_threshold` samples are yielded as a single batch. With
+    `reuse_buffers`, batches are gathered into preallocated buffers (pinned when
+    `pin_memory` is set and the data lives on the CPU) that are overwritten by the
+    next batch, so a batch must not be kept across iterations.
+    """
+
+    def __init__(
+        self,
+        X,
+        Y,
+        batch_size=64,
+        shuffle=True,
+        device=None,
+        full_batch_threshold=None,
+        reuse_buffers=False,
+        pin_memory=False
+    ):
+        assert len(Y) == len(X)
+        self.X = X
+        self.Y = Y
+        self.n_samples = len(X)
+        self.device = torch.device(device) if device is not None else X.device
+        self.shuffle = shuffle
+        self.full_batch = full_batch_threshold is not None and self.n_samples <= full_batch_threshold
+        self.batch_size = self.n_samples if self.full_batch else batch_size
+
+        self._buffers = None
+        if reuse_buffers and not self.full_batch:
+            pin = pin_memory and X.device.type == 'cpu' and self.device.type == 'cuda'
+            self._buffers = tuple(
+                torch.empty((self.batch_size, *T.shape[1:]), dtype=T.dtype, device=T.device, pin_memory=pin)
+                for T in (X, Y)
+            )
+
+    def __len__(self):
+        return (self.n_samples + self.batch_size - 1) // self.batch_size
+
+    def _gather(self, idx):
+        if self._buffers is None:
+            return self.X[idx], self.Y[idx]
+
+        X_buffer, Y_buffer = (buffer[:len(idx)] for buffer in self._buffers)
+        torch.index_select(self.X, 0, idx, out=X_buffer)
+        torch.index_select(self.Y, 0, idx, out=Y_buffer)
+        return X_buffer, Y_buffer
+
+    def _to_device(self, T):
+        if T.device == self.device:
+            return T
+        return T.to(self.device, non_blocking=T.is_pinned())
+
+    def __iter__(self):
+        if self.full_batch:
+            yield self._to_device(self.X), self._to_device(self.Y)
+            return
+
+        if self.shuffle:
+            order = torch.randperm(self.n_samples, device=self.X.device)
+        else:
+            order = torch.arange(self.n_samples, device=self.X.device)
+
+        for start in range(0, self.n_samples, self.batch_size):
+            X_batch, Y_batch = self._gather(order[start:start + self.batch_size])
+            yield self._to_device(X_batch), self._to_device(Y_batch)
+
+
+class ReplicateBatches:
+    """
+    Mini-batches for stacked replicates: `X` and `Y` carry the replicate dimension first,
+    and every replicate is shuffled with its own permutation each epoch. Replicates of
+    at most `full_batch_threshold` samples are yielded whole, as `TensorBatches` does.
+    """
+
+    def __init__(self, X, Y, batch_size=64, full_batch_threshold=None):
+        assert X.shape[:2] == Y.shape[:2]
+        self.X = X
+        self.Y = Y
+        self.n_replicates, self.n_samples = Y.shape[:2]
+        self.full_batch = full_batch_threshold is not None and self.n_samples <= full_batch_threshold
+        self.batch_size = self.n_samples if self.full_batch else batch_size
+        self._replicate_idx = torch.arange(self.n_replicates, device=X.device).unsqueeze(1)
+
+    def __len__(self):
+        return (self.n_samples + self.batch_size - 1) // self.batch_size
+
+    def __iter__(self):
+        if self.full_batch:
+            # the order within a single batch does not change the step
+            yield self.X, self.Y
+            return
+
+        # one independent permutation per replicate
+        order = torch.argsort(torch.rand(self.n_replicates, self.n_samples, device=self.X.device), dim=1)
+        for start in range(0, self.n_samples, self.batch_size):
+            idx = order[:, start:start + self.batch_size]
+            yield self.X[self._replicate_idx, idx], self.Y[self._replicate_idx, idx]
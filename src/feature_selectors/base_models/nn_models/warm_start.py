@@ -0,0 +1,118 @@
+import hashlib
+import os
+from collections import OrderedDict
+
+
+class WarmStartStore:
+    """
+    Keeps the trained weights of full-data (`sampling='none'`) fits so that resampled
+    runs of the same selector on the same dataset can start from them.
+
+    Entries are keyed by the source run (algorithm, params, dataset and seed, see
+    `Task.warm_start_source`), the selector and the model architecture (the names and
+    shapes of its state), so a state is only ever loaded into an identical model trained
+    the same way. They live in a small per-process LRU and, when `cache_dir` is given, are also
+    saved to disk so worker processes share them.
+    """
+
+    _memory = OrderedDict()
+    MEMORY_SIZE = 16
+    # used by selectors whose `warm_start` does not set a `cache_dir`
+    default_cache_dir = None
+
+    def __init__(self, cache_dir=None):
+        self._cache_dir = cache_dir
+
+    @staticmethod
+    def key(source, selector_name, model):
+        digest = hashlib.sha1()
+        architecture = [(name, tuple(value.shape)) for name, value in model.state_dict().items()]
+        digest.update(repr((source, selector_name, architecture)).encode())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self._cache_dir, f'{key}.pt')
+
+    def load(self, key):
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+
+        if self._cache_dir is not None and os.path.exists(self._path(key)):
+            # deferred, task processes that never warm start do not need torch here
+            import torch
+            try:
+                return torch.load(self._path(key), map_location='cpu')
+            except Exception:
+                return None
+        return None
+
+    def save(self, key, model):
+        state = {name: value.detach().cpu().clone() for name, value in model.state_dict().items()}
+        self._memory[key] = state
+        while len(self._memory) > self.MEMORY_SIZE:
+            self._memory.popitem(last=False)
+
+        if self._cache_dir is not None:
+            import torch
+            os.makedirs(self._cache_dir, exist_ok=True)
+            # write to a process-unique file first so readers never see partial states
+            tmp_path = f'{self._path(key)}.{os.getpid()}.tmp'
+            torch.save(state, tmp_path)
+            os.replace(tmp_path, self._path(key))
+
+
+class WarmStart:
+    """
+    Warm-start decisions for one fit of a selector.
+
+    A full-data fit trains as usual and records its final weights; a resampled fit loads
+    them, when present, and trains for `epochs` instead of the selector's full budget.
+    """
+
+    def __init__(self, selector_name, source, sampling, epochs, cache_dir=None):
+        self.selector_name = selector_name
+        self.source = source
+        self.sampling = sampling
+        self.epochs = epochs
+        self.store = WarmStartStore(cache_dir)
+        self.warm_started = False
+
+    def initialize(self, model, epochs):
+        """
+        Loads the full-data weights into `model` for resampled runs, returns the epoch budget.
+        """
+        if self.sampling == 'none':
+            return epochs
+
+        state = self.store.load(WarmStartStore.key(self.source, self.selector_name, model))
+        if state is None:
+            return epochs
+
+        model.load_state_dict(state)
+        self.warm_started = True
+        return self.epochs if self.epochs is not None else max(1, epochs // 4)
+
+    def record(self, model):
+        if self.sampling == 'none':
+            self.store.save(WarmStartStore.key(self.source, self.selector_name, model), model)
+
+
+def warm_start_for(selector, source=None, sampling=None):
+    """
+    Builds the `WarmStart` of a fit from a selector's `warm_start` parameter.
+
+    `warm_start` is either falsy (disabled), True (defaults) or a dict with `epochs` and
+    `cache_dir`. Fits that do not know their source run or sampling never warm start.
+    """
+    if not selector.warm_start or source is None or sampling is None:
+        return None
+
+    params = selector.warm_start if isinstance(selector.warm_start, dict) else {}
+    return WarmStart(
+        type(selector).__name__,
+        source,
+        sampling,
+        params.get('epochs'),
+        params.get('cache_dir', WarmStartStore.default_cache_dir)
+    )
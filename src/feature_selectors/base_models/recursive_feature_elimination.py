@@ -1,40 +1,122 @@
 from time import time
 import numpy as np
+from sklearn.base import clone
 from sklearn.preprocessing import label_binarize
 
 from .base_selector import BaseSelector, ResultType
 
 
+def _linear_coef_from_dual(model, support_vectors):
+    """
+    Rebuilds the primal `coef_` of a libsvm classifier fitted on a precomputed
+    linear Gram matrix, mirroring what `SVC(kernel='linear').coef_` returns.
+    """
+    dual_coef = model.dual_coef_
+    if dual_coef.shape[0] == 1:
+        return np.dot(dual_coef, support_vectors)
+
+    n_classes = dual_coef.shape[0] + 1
+    sv_locs = np.cumsum(np.hstack([[0], model.n_support_]))
+    coef = []
+    for class1 in range(n_classes):
+        sv1 = support_vectors[sv_locs[class1]:sv_locs[class1 + 1]]
+        for class2 in range(class1 + 1, n_classes):
+            sv2 = support_vectors[sv_locs[class2]:sv_locs[class2 + 1]]
+            alpha1 = dual_coef[class2 - 1, sv_locs[class1]:sv_locs[class1 + 1]]
+            alpha2 = dual_coef[class1, sv_locs[class2]:sv_locs[class2 + 1]]
+            coef.append(np.dot(alpha1, sv1) + np.dot(alpha2, sv2))
+
+    return np.vstack(coef)
+
+
 class RFE(BaseSelector):
+    """
+    Recursive feature elimination.
+
+    `step` controls the elimination schedule: an int removes that many features per
+    round, a float in (0, 1) removes that fraction of the remaining features per round.
+    When `hybrid_threshold` is set, the schedule falls back to removing a single feature
+    per round once the remaining features are within `hybrid_threshold` of the target.
+    Features removed in the same round are ordered by their weights, so the rank stays
+    fully defined regardless of the schedule.
+
+    With `precompute_gram=True` the model is fitted on a linear sample Gram matrix that is
+    computed once and downdated by the removed features every round. This requires a model
+    that accepts `kernel='precomputed'` (e.g. `SVC`) and is only equivalent to a linear kernel.
+    """
 
     result_type = ResultType.SUBSET
 
-    def __init__(self, model, weights_attr, is_callable=False, n_features=None, encode_classes=False, verbose=0):
+    def __init__(
+        self,
+        model,
+        weights_attr,
+        is_callable=False,
+        n_features=None,
+        encode_classes=False,
+        verbose=0,
+        step=1,
+        hybrid_threshold=None,
+        precompute_gram=False
+    ):
         super().__init__(n_features)
         self._model = model
         self._weights_attr = weights_attr
         self._is_callable = is_callable
         self._encode = encode_classes
         self._verbose = verbose
+        self._step = step
+        self._hybrid_threshold = hybrid_threshold
+        self._precompute_gram = precompute_gram
+
+        if not (isinstance(step, int) and step >= 1) and not (isinstance(step, float) and 0 < step < 1):
+            raise ValueError(f"`step` must be an int >= 1 or a float in (0, 1), got {step}")
+
+        if precompute_gram:
+            self._model = clone(model).set_params(kernel='precomputed')
 
         if n_features is None:
             self.result_type = ResultType.RANK
 
-    def _select_worst(self, X, y, remaining, **kwargs):
-        if len(remaining) == 1:
-            return remaining[0]
+    def _num_to_remove(self, num_remaining, num_target):
+        num_left = num_remaining - num_target
+
+        if self._hybrid_threshold is not None and num_left <= self._hybrid_threshold:
+            return 1
+
+        if isinstance(self._step, float):
+            step = int(num_remaining * self._step)
+        else:
+            step = self._step
 
+        return int(np.clip(step, 1, num_left))
+
+    def _feature_weights(self, X, y, remaining, gram, **kwargs):
         _y = label_binarize(y = y, classes = np.unique(y)) if self._encode else y
-        self._model.fit(X[:, remaining], _y, **kwargs)
 
-        weights = eval(f'self._model.{self._weights_attr}{"()" if self._is_callable else ""}')
+        if gram is not None:
+            self._model.fit(gram, _y, **kwargs)
+            support_vectors = X[np.ix_(self._model.support_, remaining)]
+            weights = _linear_coef_from_dual(self._model, support_vectors)
+        else:
+            self._model.fit(X[:, remaining], _y, **kwargs)
+            weights = eval(f'self._model.{self._weights_attr}{"()" if self._is_callable else ""}')
+
         if len(weights.shape) > 1:
             weights = weights.sum(axis=0)
 
-        worst_idx = np.argmin(weights)
-        worst_feat = remaining[worst_idx]
+        return weights
+
+    def _select_worst(self, X, y, remaining, num_to_remove=1, gram=None, **kwargs):
+        if len(remaining) == 1:
+            return [remaining[0]]
+
+        weights = self._feature_weights(X, y, remaining, gram, **kwargs)
 
-        return worst_feat
+        worst_idx = np.argsort(weights, kind='stable')[:num_to_remove]
+        worst_feats = [remaining[i] for i in worst_idx]
+
+        return worst_feats
 
     def fit(self, X, y, n_informative, **kwargs):
         self.check_already_fitted()
@@ -44,26 +126,40 @@ class RFE(BaseSelector):
 
         n_features = 0 if self._n_features is None else self._n_features
 
-        num_feats_to_remove = num_feats - np.min(np.array([num_feats, n_features]))
+        num_target = np.min(np.array([num_feats, n_features]))
+        num_feats_to_remove = num_feats - num_target
 
         remaining = list(range(num_feats))
         reverse_rank = []
 
+        gram = np.dot(X, X.T) if self._precompute_gram else None
+
         start = time()
 
-        for i in range(num_feats_to_remove):
-            selected_idx = self._select_worst(X, y, remaining, **kwargs)
-            remaining.remove(selected_idx)
-            reverse_rank.append(selected_idx)
+        while len(reverse_rank) < num_feats_to_remove:
+            num_to_remove = self._num_to_remove(len(remaining), num_target)
+            removed = self._select_worst(X, y, remaining, num_to_remove, gram=gram, **kwargs)
+
+            removed_set = set(removed)
+            remaining = [f for f in remaining if f not in removed_set]
+            reverse_rank.extend(removed)
+
+            if gram is not None and remaining:
+                X_removed = X[:, removed]
+                gram -= np.dot(X_removed, X_removed.T)
 
             if self._verbose:
-                print(f'[{i+1}/{num_feats_to_remove}] removed variable {selected_idx}. {time() - start:.0f}s')
+                print(
+                    f'[{len(reverse_rank)}/{num_feats_to_remove}] removed {len(removed)} variables '
+                    f'(last {removed[-1]}). {time() - start:.0f}s'
+                )
+
         if self._n_features is None:
             self._rank = reverse_rank[::-1]
         else:
             self._selected = np.copy(remaining)
             self._support_mask = np.zeros(X.shape[1])
-            self._support_mask[self._rank] = True
+            self._support_mask[self._selected] = True
 
         self._fitted = True
         return self
@@ -0,0 +1,81 @@
+from abc import abstractmethod
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.preprocessing import label_binarize
+
+from .base_selector import BaseSelector, ResultType
+
+
+class BasePathFeatureSelector(BaseSelector):
+    """
+    Base class for selectors that fit a whole regularization path in one call.
+
+    Every class of the (label-binarized) target gets its own path, fitted in parallel.
+    Features are ranked by the path step at which they first become active, ties broken
+    by their magnitude at the end of the path, so one fit answers every `n_features`.
+    """
+
+    result_type = ResultType.RANK
+
+    def __init__(self, n_features=None, n_jobs=-1):
+        super().__init__(n_features)
+        self._n_jobs = n_jobs
+        self._penalties = None
+        self._path = None
+
+    def _precompute(self, X):
+        return {}
+
+    @abstractmethod
+    def _fit_path(self, X, y, **precomputed):
+        """
+        Returns the penalties from the strongest to the weakest regularization and
+        the coefficients of shape (n_features, n_penalties) along them.
+        """
+        raise NotImplementedError()
+
+    def fit(self, X, y, n_informative):
+        self.check_already_fitted()
+        self._X = X
+
+        Y = label_binarize(y=y, classes=np.unique(y))
+        precomputed = self._precompute(X)
+
+        # coordinate descent and liblinear release the GIL, threads avoid copying X
+        paths = Parallel(n_jobs=self._n_jobs, prefer='threads')(
+            delayed(self._fit_path)(X, Y[:, k], **precomputed)
+            for k in range(Y.shape[1])
+        )
+
+        self._penalties = paths[0][0]
+        self._path = np.sum([np.abs(coefs) for _, coefs in paths], axis=0)
+
+        n_steps = self._path.shape[1]
+        active = self._path > 0
+        entry_step = np.where(active.any(axis=1), active.argmax(axis=1), n_steps)
+
+        self._weights = self._path[:, -1].tolist()
+        self._rank = np.lexsort((-self._path[:, -1], entry_step))
+
+        if self._n_features is not None:
+            self._selected = self._rank[:self._n_features]
+            self._support_mask = np.zeros(X.shape[1], dtype=bool)
+            self._support_mask[self._selected] = True
+
+        self._fitted = True
+        return self
+
+    def get_path(self):
+        self._check_fit()
+        return self._penalties, self._path
+
+    def get_weights_at(self, n_features):
+        """
+        Weights at the first step of the path where at least `n_features` are active.
+        """
+        self._check_fit()
+        num_active = (self._path > 0).sum(axis=0)
+        reached = np.flatnonzero(num_active >= n_features)
+        step = reached[0] if len(reached) else self._path.shape[1] - 1
+        return self._path[:, step]
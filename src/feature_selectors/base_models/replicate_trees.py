@@ -0,0 +1,91 @@
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.preprocessing import minmax_scale
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.utils import check_random_state
+
+from .embedded import BaseEmbeddedFeatureSelector
+
+
+def _fit_tree(tree, X, y, sample_weight):
+    tree.fit(X, y, sample_weight=sample_weight)
+    return tree
+
+
+def _group_importances(trees):
+    importances = [tree.feature_importances_ for tree in trees if tree.tree_.node_count > 1]
+    if not importances:
+        return np.zeros(trees[0].n_features_in_)
+
+    importances = np.mean(importances, axis=0)
+    return importances / np.sum(importances)
+
+
+class BaseReplicateTreesFeatureSelector(BaseEmbeddedFeatureSelector):
+    """
+    Tree based selector that can also produce many stability replicates from a single fit.
+
+    In replicate mode every replicate gets `trees_per_replicate` trees that are trained on
+    the full data with sample weights counting how often each instance appears in the
+    replicate's resample (plus each tree's own bootstrap when `inner_bootstrap` is set),
+    so no resampled copy of `X` is ever materialized. The trees of all replicates are
+    trained together on `n_jobs` threads, then grouped back into one importance vector
+    per replicate.
+    """
+
+    supports_replicates = True
+
+    def __init__(self, model, tree_params, n_features=None, trees_per_replicate=1, inner_bootstrap=False, n_jobs=-1):
+        super().__init__(model, 'feature_importances_', n_features=n_features)
+        self._tree_params = tree_params
+        self._trees_per_replicate = trees_per_replicate
+        self._inner_bootstrap = inner_bootstrap
+        self._n_jobs = n_jobs
+        self._replicate_weights = None
+
+    def _sample_weights(self, indices, n_samples, random_state):
+        if self._inner_bootstrap:
+            indices = indices[random_state.randint(0, len(indices), len(indices))]
+        return np.bincount(indices, minlength=n_samples).astype(float)
+
+    def fit_replicates(self, X, y, n_informative, index_sets):
+        self.check_already_fitted()
+        self._X = X
+
+        n_samples = X.shape[0]
+        random_state = check_random_state(self._tree_params.get('random_state'))
+        tree_params = {**self._tree_params}
+
+        jobs = []
+        for indices in index_sets:
+            for _ in range(self._trees_per_replicate):
+                tree_params['random_state'] = random_state.randint(np.iinfo(np.int32).max)
+                tree = DecisionTreeClassifier(**tree_params)
+                jobs.append((tree, self._sample_weights(np.asarray(indices), n_samples, random_state)))
+
+        # tree building releases the GIL, threads avoid copying X to every worker
+        trees = Parallel(n_jobs=self._n_jobs, prefer='threads')(
+            delayed(_fit_tree)(tree, X, y, sample_weight) for tree, sample_weight in jobs
+        )
+
+        self._replicate_weights = [
+            _group_importances(trees[i:i + self._trees_per_replicate])
+            for i in range(0, len(trees), self._trees_per_replicate)
+        ]
+
+        self._weights = np.mean(self._replicate_weights, axis=0).tolist()
+        self._rank = np.argsort(self._weights)[::-1]
+
+        if self._n_features is not None:
+            self._selected = self._rank[:self._n_features]
+            self._support_mask = np.zeros(X.shape[1])
+            self._support_mask[self._selected] = True
+
+        self._fitted = True
+        return self
+
+    def get_replicate_weights(self):
+        self._check_fit()
+        if self._replicate_weights is None:
+            raise Exception("This selector was not fitted in replicate mode!")
+        return [minmax_scale(weights) for weights in self._replicate_weights]
@@ -2,6 +2,9 @@ import numpy as np
 from sklearn.preprocessing import LabelEncoder
 from feature_selectors.base_models.base_selector import BaseSelector, ResultType
 from .base_models.nn_models.concrete_autoencoder import ConcreteAutoencoderFeatureSelector
+from .base_models.nn_models.early_stopping import ranking_convergence
+from .base_models.nn_models.engine import seed_everything
+from .base_models.nn_models.keras_callbacks import RankingConvergenceCallback
 import keras
 
 class CAEFeatureSelector(BaseSelector):
@@ -12,11 +15,29 @@ class CAEFeatureSelector(BaseSelector):
     result_type = ResultType.SUBSET
     DEFAULT_HIDDEN_DIMS = (32, 32, 32)
 
-    def __init__(self, n_features=None, hidden_dims=None, **kwargs):
+    def __init__(
+        self,
+        n_features=None,
+        hidden_dims=None,
+        early_stopping=None,
+        seed=None,
+        epochs=400,
+        batch_size=None,
+        tf_data=True,
+        jit_compile='auto',
+        **kwargs
+    ):
         super().__init__(n_features)
         self.hidden_dims = tuple(hidden_dims) if hidden_dims is not None else self.DEFAULT_HIDDEN_DIMS
+        self.early_stopping = early_stopping
+        self.seed = seed
+        self.epochs = epochs
+        self.batch_size = batch_size
+        self.tf_data = tf_data
+        self.jit_compile = jit_compile
         
     def fit(self, X, y, n_informative, **kwargs):
+        seed_everything(self.seed)
         n_classes = len(np.unique(y))
         
         # --- Define the neural network for the CAE ---
@@ -35,15 +56,26 @@ class CAEFeatureSelector(BaseSelector):
             output_function=nn, 
             start_temp=10, 
             min_temp=0.01,
-            num_epochs=400,
+            num_epochs=self.epochs,
             learning_rate=0.0001,
-            tryout_limit=1)
+            tryout_limit=1,
+            batch_size=self.batch_size,
+            tf_data=self.tf_data,
+            jit_compile=self.jit_compile)
         
         # --- Preprocessing --- 
         y_encoded = LabelEncoder().fit_transform(y)
 
+        # --- Early stopping on the selected subset ---
+        callbacks = []
+        criterion = ranking_convergence(self.early_stopping, selector.get_feature_probabilities, top_k=2 * n_informative)
+        if criterion is not None:
+            callbacks.append(RankingConvergenceCallback(criterion))
+
         # --- Model training ---
-        selector.fit(X, y_encoded)
+        selector.fit(X, y_encoded, callbacks=callbacks)
+        self._epochs = selector.epochs_
+        self.epoch_times_ = selector.epoch_times_
 
         # --- Feature selection ---
         self._selected = selector.get_support(indices=True).flatten()
@@ -4,6 +4,9 @@ import numpy as np
 from sklearn.preprocessing import LabelEncoder
 
 from feature_selectors.base_models import BaseEmbeddedFeatureSelector
+from feature_selectors.base_models.nn_models.early_stopping import ranking_convergence
+from feature_selectors.base_models.nn_models.keras_callbacks import EpochTimer, RankingConvergenceCallback
+from feature_selectors.base_models.nn_models.keras_data import training_dataset
 from keras.utils import register_keras_serializable
 
 tf.get_logger().setLevel('ERROR')
@@ -24,6 +27,7 @@ class CancelOutFeatureSelector(BaseEmbeddedFeatureSelector):
         lambda_2 = 0.1,
         batch_size = 35,
         encode_classes=False,
+        early_stopping=None,
         **kwargs
     ):
 
@@ -38,6 +42,7 @@ class CancelOutFeatureSelector(BaseEmbeddedFeatureSelector):
             cancelout_loss=cancelout_loss,
             epochs=epochs,
             batch_size=batch_size,
+            early_stopping=early_stopping,
             **kwargs
         )
 
@@ -49,6 +54,12 @@ class CancelOutFeatureSelector(BaseEmbeddedFeatureSelector):
             encode_classes=encode_classes
         ) 
 
+    def fit(self, X, y, n_informative, **kwargs):
+        # early stopping watches the top 2k features, as the other NN selectors do
+        super().fit(X, y, n_informative, top_k=2 * n_informative, **kwargs)
+        self._epochs = self._model.epochs_
+        return self
+
 class CancelOutModel:
 
     def __init__(
@@ -60,7 +71,10 @@ class CancelOutModel:
         epochs=100,
         batch_size=32,
         hidden_layers=None,
-        verbose=0
+        verbose=0,
+        early_stopping=None,
+        tf_data=True,
+        jit_compile='auto'
     ):
         self.activation = activation
         self.lambda_1 = lambda_1
@@ -70,7 +84,9 @@ class CancelOutModel:
         self.batch_size = batch_size
         self.hidden_layers = hidden_layers
         self.verbose = verbose
-
+        self.early_stopping = early_stopping
+        self.tf_data = tf_data
+        self.jit_compile = jit_compile
 
     def _build_model(self):
 
@@ -88,22 +104,37 @@ class CancelOutModel:
         self.model.compile(
             optimizer="adam",
             loss="binary_crossentropy",
-            metrics=["accuracy"]
+            metrics=["accuracy"],
+            jit_compile=self.jit_compile
         )
 
-    def fit(self, X, y, **kwargs):
+    def fit(self, X, y, top_k=None, **kwargs):
         le = LabelEncoder()
         _y = le.fit_transform(y)
         self.input_dim = X.shape[1]
         self._build_model()
-        self.model.fit(
-            X,
-            _y,
+
+        timer = EpochTimer()
+        callbacks = list(kwargs.pop('callbacks', [])) + [timer]
+        criterion = ranking_convergence(self.early_stopping, self.get_weights_mask, top_k=top_k)
+        if criterion is not None:
+            callbacks.append(RankingConvergenceCallback(criterion))
+
+        if self.tf_data:
+            # batches come from a cached, prefetched pipeline instead of NumPy slicing
+            data = {'x': training_dataset(X, _y, self.batch_size), 'shuffle': False}
+        else:
+            data = {'x': X, 'y': _y, 'batch_size': self.batch_size}
+
+        history = self.model.fit(
+            **data,
             epochs=self.epochs,
-            batch_size=self.batch_size,
             verbose=self.verbose,
+            callbacks=callbacks,
             **kwargs
         )
+        self.epochs_ = len(history.epoch)
+        self.epoch_times_ = timer.epoch_times
 
         return self
 
@@ -0,0 +1,131 @@
+import numpy as np
+from sklearn.preprocessing import LabelEncoder
+import torch
+
+from feature_selectors.base_models.base_selector import BaseSelector, ResultType
+
+from .base_models.nn_models.early_stopping import ranking_convergence
+from .base_models.nn_models.engine import seed_everything
+from .base_models.nn_models.nn_wrapper import ModelWithCancelOut, NNwrapper
+from .base_models.nn_models.warm_start import warm_start_for
+
+class CancelOutTorchFeatureSelector(BaseSelector):
+    """
+    CancelOut feature selector on torch, trained with `NNwrapper`.
+
+    Mirrors the Keras `CancelOutFeatureSelector`: the CancelOut weights start uniform in
+    [-0.3, 0.3], every batch adds `lambda_1 * sum(|act(w)|) + lambda_2 * ||w||_2` to the
+    loss, the dense layers have no dropout nor weight decay, and the feature weights are
+    the activated CancelOut weights.
+    """
+    result_type = ResultType.WEIGHTS
+    supports_warm_start = True
+    supports_data_parallel = True
+    DEFAULT_HIDDEN_LAYERS = (32, 32, 32)
+
+    def __init__(
+        self,
+        n_features=None,
+        hidden_layers=None,
+        activation="sigmoid",
+        epochs=400,
+        cancelout_loss=True,
+        lambda_1=0.2,
+        lambda_2=0.1,
+        batch_size=35,
+        learning_rate=1e-3,
+        full_batch_threshold=None,
+        early_stopping=None,
+        seed=None,
+        n_threads=None,
+        warm_start=False,
+        n_procs=None,
+        **kwargs
+    ):
+        super().__init__(n_features)
+        self.hidden_layers = tuple(hidden_layers) if hidden_layers else self.DEFAULT_HIDDEN_LAYERS
+        self.activation = activation
+        self.epochs = epochs
+        self.cancelout_loss = cancelout_loss
+        self.lambda_1 = lambda_1
+        self.lambda_2 = lambda_2
+        self.batch_size = batch_size
+        self.learning_rate = learning_rate
+        self.full_batch_threshold = full_batch_threshold
+        self.early_stopping = early_stopping
+        self.seed = seed
+        self.n_threads = n_threads
+        self.warm_start = warm_start
+        self.n_procs = n_procs
+
+    def fit(self, X, y, n_informative, warm_start_source=None, sampling=None, n_procs=None, **kwargs):
+        self.check_already_fitted()
+        device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        seed_everything(self.seed)
+
+        # --- Preprocessing ---
+        y = LabelEncoder().fit_transform(y)
+        n_classes = len(np.unique(y))
+
+        X_tensor = torch.tensor(np.asarray(X), dtype=torch.float32, device=device)
+        y_tensor = torch.tensor(y, dtype=torch.long, device=device)
+
+        # --- Model ---
+        model = ModelWithCancelOut(
+            X.shape[1],
+            n_classes,
+            hidden_dims=self.hidden_layers,
+            cancel_out_activation=self.activation,
+            dropout=0
+        )
+        cancel_out = model.cancel_out
+        torch.nn.init.uniform_(cancel_out.weights, -0.3, 0.3)
+
+        wrapper = NNwrapper(model, n_classes)
+
+        # --- Regularization ---
+        if self.cancelout_loss:
+            wrapper.add_loss_callback(
+                lambda: self.lambda_1 * torch.sum(torch.abs(cancel_out.get_weights()))
+                + self.lambda_2 * torch.norm(cancel_out.weights, p=2)
+            )
+
+        def importances():
+            with torch.no_grad():
+                return cancel_out.get_weights().cpu().numpy()
+
+        # resampled runs may start from the full-data weights
+        warm_start = warm_start_for(self, warm_start_source, sampling)
+        epochs = warm_start.initialize(model, self.epochs) if warm_start else self.epochs
+
+        # --- Training ---
+        wrapper.fit(
+            X_tensor,
+            y_tensor,
+            device=device,
+            learning_rate=self.learning_rate,
+            epochs=epochs,
+            batch_size=self.batch_size,
+            weight_decay=0,
+            full_batch_threshold=self.full_batch_threshold,
+            early_stopping=ranking_convergence(self.early_stopping, importances, top_k=2 * n_informative),
+            n_threads=self.n_threads,
+            n_procs=n_procs or self.n_procs
+        )
+        self._epochs = wrapper.epochs_
+        if warm_start:
+            warm_start.record(model)
+            self._warm_started = warm_start.warm_started
+
+        # --- Extract Importance ---
+        self._X = X
+        self._weights = importances().astype(float).tolist()
+        self._rank = np.argsort(self._weights)[::-1]
+
+        if self._n_features is not None:
+            self._selected = self._rank[:self._n_features]
+            self._support_mask = np.zeros(X.shape[1])
+            self._support_mask[self._selected] = True
+
+        self._fitted = True
+        return self
@@ -1,9 +1,10 @@
 from sklearn.tree import DecisionTreeClassifier
 
 
-from feature_selectors.base_models.embedded import BaseEmbeddedFeatureSelector
+from feature_selectors.base_models.replicate_trees import BaseReplicateTreesFeatureSelector
 
 
-class DecisionTreeFeatureSelector(BaseEmbeddedFeatureSelector):
-    def __init__(self, n_features=None, **kwargs):
-        super().__init__(DecisionTreeClassifier(**kwargs), 'feature_importances_', n_features=n_features)
+class DecisionTreeFeatureSelector(BaseReplicateTreesFeatureSelector):
+    def __init__(self, n_features=None, n_jobs=-1, **kwargs):
+        model = DecisionTreeClassifier(**kwargs)
+        super().__init__(model, model.get_params(), n_features=n_features, n_jobs=n_jobs)
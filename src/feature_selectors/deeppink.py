@@ -1,61 +1,106 @@
 import numpy as np
 from sklearn.preprocessing import LabelEncoder
 import torch
-import scipy
 
-from sklearn.preprocessing import StandardScaler
+from sklearn.preprocessing import StandardScaler, minmax_scale
 
 from feature_selectors.base_models.base_selector import BaseSelector, ResultType
 from feature_selectors.base_models.nn_models.nn_wrapper import NNwrapper, Model
 from .base_models.nn_models.deeppink import DeepPINK
+from .base_models.nn_models.knockoffs import GaussianKnockoffs, KnockoffFactorsCache, knockoff_generator
+from .base_models.nn_models.early_stopping import ranking_convergence
+from .base_models.nn_models.engine import seed_everything
+from .base_models.nn_models.replicates import ReplicateTrainer
+from .base_models.nn_models.warm_start import warm_start_for
 
 class Deeppink(BaseSelector):
     """
     DeepPINK feature selector using knockoffs and neural networks.
     """
     result_type = ResultType.WEIGHTS
+    supports_replicates = True
+    supports_warm_start = True
+    supports_data_parallel = True
     DEFAULT_HIDDEN_DIMS = (32, 32, 32)
 
-    def __init__(self, n_features=None, hidden_dims=None, **kwargs):
+    def __init__(
+        self,
+        n_features=None,
+        hidden_dims=None,
+        knockoffs='auto',
+        knockoffs_block_size=500,
+        knockoffs_cache=True,
+        knockoffs_cache_dir=None,
+        full_batch_threshold=None,
+        early_stopping=None,
+        seed=None,
+        n_threads=None,
+        epochs=200,
+        warm_start=False,
+        n_procs=None,
+        **kwargs
+    ):
         super().__init__(n_features)
         self.hidden_dims = tuple(hidden_dims) if hidden_dims is not None else self.DEFAULT_HIDDEN_DIMS
+        self.knockoffs = knockoffs
+        self.knockoffs_block_size = knockoffs_block_size
+        self.knockoffs_cache = knockoffs_cache
+        self.knockoffs_cache_dir = knockoffs_cache_dir
+        self.full_batch_threshold = full_batch_threshold
+        self.early_stopping = early_stopping
+        self.seed = seed
+        self.n_threads = n_threads
+        self.epochs = epochs
+        self.warm_start = warm_start
+        self.n_procs = n_procs
+        self._replicate_weights = None
     
     @staticmethod
     def generate_gaussian_knockoffs(X, eps=1e-3, lambda_=0.7):
         """
         Generate Gaussian knockoff features preserving covariance structure.
         """
-        # Compute mean and empirical variance
-        mu = np.mean(X, axis=0)
-        sigma = np.cov(X, rowvar=False)
+        return GaussianKnockoffs(eps=eps, lambda_=lambda_).generate(X)
+          
+    def _augment(self, X):
+        X = StandardScaler().fit_transform(X)
 
-        # Regularize covariance for stability
-        sigma_reg = lambda_ * np.diag(np.diagonal(sigma)) + (1. - lambda_) * sigma
+        knockoffs = knockoff_generator(self.knockoffs, *X.shape, block_size=self.knockoffs_block_size)
+        if self.knockoffs_cache:
+            # repeated runs on the same data only pay for the random draw
+            knockoffs = KnockoffFactorsCache(self.knockoffs_cache_dir).fit(knockoffs, X, variant='standard_scaler')
+        else:
+            knockoffs.fit(X)
+        return knockoffs.sample(X)
 
-        # Compute diagonal s matrix for knockoffs
-        S = np.diag(np.diagonal(sigma_reg))
+    def _build_model(self, n_features, n_classes):
+        base_model = Model(n_features, n_classes, hidden_dims=self.hidden_dims)
+        model = DeepPINK(base_model, n_features)
 
-        # Compute matrix for knockoff covariance
-        sigma_inv_S = scipy.linalg.lstsq(sigma_reg, S)[0]
-        V = 2. * S - np.dot(S, sigma_inv_S)
-        L = np.linalg.cholesky(V + eps * np.eye(X.shape[1]))
+        # --- Regularization ---
+        _lambda = 0.05 * np.sqrt(2.0 * np.log(n_features) / 1000)
+        penalized = [name for name, layer in model.named_children() if isinstance(layer, torch.nn.Linear)]
+        return model, _lambda, penalized
 
-        # Center X and Compute knockoffs
-        mu_tilde = X - (X - np.broadcast_to(mu, X.shape)) @ sigma_inv_S
-        X_knock = mu_tilde + np.random.normal(size=X.shape) @ L.T
+    def _set_weights(self, weights):
+        self._weights = weights
+        self._rank = np.argsort(self._weights)[::-1]
 
-        return np.stack([X, X_knock], axis=2) 
-          
-    def fit(self, X, y, n_informative, **kwargs):
+        if self._n_features is not None:
+            self._selected = self._rank[:self._n_features]
+            self._support_mask = np.zeros(len(weights))
+            self._support_mask[self._rank] = True
+
+        self._fitted = True
+
+    def fit(self, X, y, n_informative, warm_start_source=None, sampling=None, n_procs=None, **kwargs):
         device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        n_classes = len(set(y))
+        seed_everything(self.seed)
 
         # --- Preprocessing ---
-        X = StandardScaler().fit_transform(X)
+        X_augmented = self._augment(X)
         y = LabelEncoder().fit_transform(y)
 
-        X_augmented = self.generate_gaussian_knockoffs(X)
-
         X_tensor = torch.tensor(X_augmented, dtype=torch.float32, device=device)
         y_tensor = torch.tensor(y, dtype=torch.long, device=device)
         
@@ -63,16 +108,11 @@ class Deeppink(BaseSelector):
         n_classes = len(np.unique(y))
 
         # --- Model ---
-        base_model = Model(n_features, n_classes, hidden_dims=self.hidden_dims)
-        model = DeepPINK(base_model, n_features)
-
-        # --- Regularization ---
-        _lambda = 0.05 * np.sqrt(2.0 * np.log(X.shape[1]) / 1000)
+        model, _lambda, penalized = self._build_model(n_features, n_classes)
 
         loss_callbacks = [
-            (lambda l=layer, lam=_lambda: lam * torch.sum(torch.abs(l.weight)))
-            for layer in model.children()
-            if isinstance(layer, torch.nn.Linear)
+            (lambda l=getattr(model, name), lam=_lambda: lam * torch.sum(torch.abs(l.weight)))
+            for name in penalized
         ]
 
         wrapper = NNwrapper(model, n_classes)
@@ -80,18 +120,107 @@ class Deeppink(BaseSelector):
         for loss_callback in loss_callbacks:
             wrapper.add_loss_callback(loss_callback)
 
+        # stops once the top 2k importances settle
+        early_stopping = ranking_convergence(self.early_stopping, model.get_weights, top_k=2 * n_informative)
+
+        # resampled runs may start from the full-data weights
+        warm_start = warm_start_for(self, warm_start_source, sampling)
+        epochs = warm_start.initialize(model, self.epochs) if warm_start else self.epochs
+
         # --- Training ---
-        wrapper.fit(X_tensor, y_tensor, device=device)
+        wrapper.fit(
+            X_tensor,
+            y_tensor,
+            device=device,
+            epochs=epochs,
+            full_batch_threshold=self.full_batch_threshold,
+            early_stopping=early_stopping,
+            n_threads=self.n_threads,
+            n_procs=n_procs or self.n_procs
+        )
+        self._epochs = wrapper.epochs_
 
         # --- Extract Importance --- 
         model.to("cpu")
-        self._weights = wrapper.model.get_weights().astype(float).tolist()
-        self._rank = np.argsort(self._weights)[::-1]
+        if warm_start:
+            warm_start.record(model)
+            self._warm_started = warm_start.warm_started
+        self._set_weights(wrapper.model.get_weights().astype(float).tolist())
+        return self
 
-        if self._n_features is not None:
-            self._selected = self._rank[:self._n_features]
-            self._support_mask = np.zeros(X.shape[1])
-            self._support_mask[self._rank] = True
+    def fit_replicates(self, X, y, n_informative, index_sets, warm_start_source=None, sampling=None):
+        """
+        Trains one DeepPINK model per index set in a single vectorized loop.
 
-        self._fitted = True
+        Every replicate gets its own standardization and knockoff draw on its resample
+        and its own initialization; the models are then stacked and trained together
+        by `ReplicateTrainer`. The reported weights are the mean over replicates.
+
+        Early stopping waits for every replicate's ranking to converge. Warm-started
+        resamples all start from the full-data weights, and a full-data task records
+        those of its first replicate, i.e. its first run.
+        """
+        self.check_already_fitted()
+        device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        seed_everything(self.seed)
+
+        # labels are encoded once so every replicate shares the class indices
+        y = LabelEncoder().fit_transform(y)
+        n_features = X.shape[1]
+        n_classes = len(np.unique(y))
+
+        X_replicates, y_replicates, models = [], [], []
+        for indices in index_sets:
+            indices = np.asarray(indices)
+            X_replicates.append(self._augment(X[indices]))
+            y_replicates.append(y[indices])
+            model, _lambda, penalized = self._build_model(n_features, n_classes)
+            models.append(model)
+
+        warm_start = warm_start_for(self, warm_start_source, sampling)
+        epochs = self.epochs
+        if warm_start:
+            for model in models:
+                epochs = warm_start.initialize(model, self.epochs)
+
+        # one criterion per replicate, each ranking converges on its own
+        early_stopping = [
+            ranking_convergence(self.early_stopping, top_k=2 * n_informative) for _ in models
+        ] if self.early_stopping else None
+
+        trainer = ReplicateTrainer(models, n_classes)
+        for name in penalized:
+            trainer.add_loss_callback(
+                lambda params, key=f'{name}.weight', lam=_lambda: lam * torch.sum(torch.abs(params[key]))
+            )
+
+        # --- Training ---
+        trainer.fit(
+            torch.tensor(np.stack(X_replicates), dtype=torch.float32),
+            torch.tensor(np.stack(y_replicates), dtype=torch.long),
+            device=device,
+            epochs=epochs,
+            full_batch_threshold=self.full_batch_threshold,
+            early_stopping=early_stopping,
+            importance_fn=lambda model: model.get_weights(),
+            n_threads=self.n_threads
+        )
+        self._epochs = trainer.epochs_
+
+        # --- Extract Importance ---
+        self._replicate_weights = []
+        for model in models:
+            model.to("cpu")
+            self._replicate_weights.append(model.get_weights().astype(float))
+        if warm_start:
+            warm_start.record(models[0])
+            self._warm_started = warm_start.warm_started
+
+        self._set_weights(np.mean(self._replicate_weights, axis=0).tolist())
         return self
+
+    def get_replicate_weights(self):
+        self._check_fit()
+        if self._replicate_weights is None:
+            raise Exception("This selector was not fitted in replicate mode!")
+        return [minmax_scale(weights) for weights in self._replicate_weights]
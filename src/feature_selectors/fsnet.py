@@ -5,7 +5,10 @@ import torch
 from feature_selectors.base_models.base_selector import BaseSelector, ResultType
 
 from .base_models.nn_models.nn_wrapper import Model
+from .base_models.nn_models.early_stopping import ranking_convergence
+from .base_models.nn_models.engine import seed_everything
 from .base_models.nn_models.fsnet import FSNet
+from .base_models.nn_models.warm_start import warm_start_for
 
 class FSNetFeatureSelector(BaseSelector):
     """
@@ -13,18 +16,37 @@ class FSNetFeatureSelector(BaseSelector):
     with reconstruction regularization.
     """
     result_type = ResultType.WEIGHTS
+    supports_warm_start = True
+    supports_data_parallel = True
     DEFAULT_HIDDEN_DIMS = (32, 32, 32)
 
     def __init__(
         self,
         n_features=None,
         hidden_dims=None,
+        check_nan_every=10,
+        full_batch_threshold=None,
+        early_stopping=None,
+        seed=None,
+        n_threads=None,
+        epochs=500,
+        warm_start=False,
+        n_procs=None,
         **kwargs
     ):
         super().__init__(n_features)
         self.hidden_dims = tuple(hidden_dims) if hidden_dims is not None else self.DEFAULT_HIDDEN_DIMS
+        self.check_nan_every = check_nan_every
+        self.full_batch_threshold = full_batch_threshold
+        self.early_stopping = early_stopping
+        self.seed = seed
+        self.n_threads = n_threads
+        self.epochs = epochs
+        self.warm_start = warm_start
+        self.n_procs = n_procs
         
-    def fit(self, X, y, n_informative, **kwargs):
+    def fit(self, X, y, n_informative, warm_start_source=None, sampling=None, n_procs=None, **kwargs):
+        seed_everything(self.seed)
         n_classes = len(set(y))
         n_features = X.shape[1]
 
@@ -44,8 +66,29 @@ class FSNetFeatureSelector(BaseSelector):
         X_tensor = torch.tensor(X, dtype=torch.float32, device=device)
         y_tensor = torch.tensor(LabelEncoder().fit_transform(y), dtype=torch.long, device=device)
 
+        def importances():
+            with torch.no_grad():
+                return fsnet.get_feature_importances()
+
+        # resampled runs may start from the full-data weights
+        warm_start = warm_start_for(self, warm_start_source, sampling)
+        epochs = warm_start.initialize(fsnet, self.epochs) if warm_start else self.epochs
+
         # --- Train FSNet ---
-        fsnet.fit(X_tensor, y_tensor)
+        fsnet.fit(
+            X_tensor,
+            y_tensor,
+            n_epochs=epochs,
+            check_nan_every=self.check_nan_every,
+            full_batch_threshold=self.full_batch_threshold,
+            early_stopping=ranking_convergence(self.early_stopping, importances, top_k=2 * n_informative),
+            n_threads=self.n_threads,
+            n_procs=n_procs or self.n_procs
+        )
+        self._epochs = fsnet.epochs_
+        if warm_start:
+            warm_start.record(fsnet)
+            self._warm_started = warm_start.warm_started
 
         # --- Extract features from model ----
         self._weights = fsnet.get_feature_importances().astype(float).tolist()
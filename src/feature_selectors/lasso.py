@@ -1,8 +1,44 @@
-from sklearn.linear_model import Lasso
+import numpy as np
+from sklearn.linear_model import Lasso, lasso_path
 
-from feature_selectors.base_models import BaseEmbeddedFeatureSelector
+from feature_selectors.base_models import BaseEmbeddedFeatureSelector, BasePathFeatureSelector
 
 
 class LassoFeatureSelector(BaseEmbeddedFeatureSelector):
     def __init__(self, n_features=None, **kwargs):
         super().__init__(Lasso(alpha=0.001, **kwargs), 'coef_', n_features=n_features, encode_classes=True)
+
+
+class LassoPathFeatureSelector(BasePathFeatureSelector):
+    """
+    Lasso regularization path from `alpha_max` down to `min_alpha`, solved with warm starts.
+    """
+
+    def __init__(self, n_features=None, n_alphas=100, min_alpha=0.001, n_jobs=-1):
+        super().__init__(n_features, n_jobs=n_jobs)
+        self._n_alphas = n_alphas
+        self._min_alpha = min_alpha
+
+    def _precompute(self, X):
+        X_centered = X - X.mean(axis=0)
+        n_samples, n_features = X.shape
+        # the Gram matrix only pays off when it is smaller than the data itself
+        gram = np.dot(X_centered.T, X_centered) if n_samples >= n_features else None
+        return {'X_centered': X_centered, 'gram': gram}
+
+    def _fit_path(self, X, y, X_centered=None, gram=None):
+        y_centered = y - y.mean()
+        Xy = np.dot(X_centered.T, y_centered)
+
+        alpha_max = max(np.max(np.abs(Xy)) / len(y), self._min_alpha)
+        alphas = np.geomspace(alpha_max, self._min_alpha, self._n_alphas)
+
+        alphas, coefs, _ = lasso_path(
+            X_centered,
+            y_centered,
+            alphas=alphas,
+            precompute=gram if gram is not None else False,
+            Xy=Xy if gram is not None else None,
+            copy_X=False
+        )
+        return alphas, coefs
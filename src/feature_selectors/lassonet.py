@@ -7,6 +7,13 @@ import torch
 class LassoNetFeatureSelector(BaseEmbeddedFeatureSelector):
     """
     LassoNet feature selector.
+
+    With `early_stopping` the regularization path is cut as soon as the active set shrinks to
+    `target_support` features (defaults to `n_features`, or `2 * n_informative` in rank mode),
+    or once the provisional top-`target_support` set has survived `rank_patience` path steps
+    that dropped features. With `adaptive_multiplier` the lambda multiplier grows while no feature leaves the
+    active set and falls back to `path_multiplier` when features start dropping. Features still
+    active when the path stops are ranked above all dropped ones by their skip-layer norm.
     """
     DEFAULT_HIDDEN_DIMS = (32, 32, 32)
 
@@ -14,6 +21,12 @@ class LassoNetFeatureSelector(BaseEmbeddedFeatureSelector):
         self,
         n_features=None,
         hidden_dims=None,
+        early_stopping=False,
+        target_support=None,
+        rank_patience=None,
+        adaptive_multiplier=False,
+        path_multiplier=1.02,
+        max_path_multiplier=1.2,
         **kwargs
     ):
         hidden_dims = tuple(hidden_dims) if hidden_dims else self.DEFAULT_HIDDEN_DIMS
@@ -24,7 +37,7 @@ class LassoNetFeatureSelector(BaseEmbeddedFeatureSelector):
         model = LassoNetClassifier(
             hidden_dims=hidden_dims,
             M= 10,
-            path_multiplier=1.02,
+            path_multiplier=path_multiplier,
             verbose = False,
             n_iters = (300,100),
             device=device,
@@ -38,8 +51,83 @@ class LassoNetFeatureSelector(BaseEmbeddedFeatureSelector):
             n_features=n_features,
             encode_classes=False
         )
-    
+
+        self._early_stopping = early_stopping
+        self._target_support = target_support
+        self._rank_patience = rank_patience
+        self._adaptive_multiplier = adaptive_multiplier
+        self._path_multiplier = path_multiplier
+        self._max_path_multiplier = max_path_multiplier
+        self._drop_lambdas = None
+        self.path_steps_ = None
+
+    def _skip_norms(self):
+        return torch.norm(self._model.model.skip.weight.data, p=2, dim=0).cpu().numpy()
+
+    def _provisional_importances(self):
+        # features still active rank above every dropped one, ordered by their skip norm
+        importances = np.copy(self._drop_lambdas)
+        active = np.isinf(importances)
+        if active.any():
+            top = np.max(importances[~active], initial=0.)
+            skip_norms = self._skip_norms()[active]
+            importances[active] = top + 1. + skip_norms / (np.max(skip_norms) + 1e-12)
+        return importances
+
+    def _lambda_seq(self, target_support):
+        """
+        Lazily consumed by `LassoNetClassifier.path`, so every step can inspect the model
+        trained at the previous lambda before deciding whether to continue.
+        """
+        model = self._model
+        lr = model.optim_path(model.model.parameters()).param_groups[0]['lr']
+        current_lambda = model.model.lambda_start(M=model.M) / lr / 10
+        multiplier = self._path_multiplier
+
+        self._drop_lambdas = np.full(model.model.skip.weight.shape[1], np.inf)
+        self.path_steps_ = 0
+        previous_top, stable_steps = None, 0
+
+        while True:
+            previous_active = np.isinf(self._drop_lambdas)
+            yield current_lambda
+            self.path_steps_ += 1
+
+            active = model.model.input_mask().cpu().numpy()
+            dropped = previous_active & ~active
+            self._drop_lambdas[dropped] = current_lambda
+
+            if active.sum() <= target_support:
+                return
+
+            if self._rank_patience and dropped.any():
+                # only steps that actually drop features count towards stability
+                top = set(np.argsort(-self._provisional_importances())[:target_support])
+                stable_steps = stable_steps + 1 if top == previous_top else 0
+                previous_top = top
+                if stable_steps >= self._rank_patience:
+                    return
+
+            if self._adaptive_multiplier:
+                if dropped.any():
+                    multiplier = self._path_multiplier
+                else:
+                    multiplier = min(1. + 2. * (multiplier - 1.), self._max_path_multiplier)
+
+            current_lambda *= multiplier
+
+    def _extract_weights(self):
+        if not self._early_stopping:
+            return super()._extract_weights()
+        return self._provisional_importances()
+
     def fit(self, X, y, n_informative):
         le = LabelEncoder()
         y = le.fit_transform(y)
-        super().fit(X, y, n_informative=n_informative)
\ No newline at end of file
+
+        if self._early_stopping:
+            target_support = self._target_support or self._n_features or 2 * n_informative
+            # LassoNetClassifier.path falls back to `lambda_seq` when none is passed to fit
+            self._model.lambda_seq = self._lambda_seq(target_support)
+
+        return super().fit(X, y, n_informative=n_informative)
@@ -1,8 +1,33 @@
-from sklearn.svm import SVC
+import numpy as np
+from sklearn.svm import SVC, LinearSVC, l1_min_c
 
-from feature_selectors.base_models.embedded import BaseEmbeddedFeatureSelector
+from feature_selectors.base_models import BaseEmbeddedFeatureSelector, BasePathFeatureSelector
 
 
 class LinearSVMFeatureSelector(BaseEmbeddedFeatureSelector):
     def __init__(self, n_features=None, **kwargs):
         super().__init__(SVC(kernel='linear', **kwargs), 'coef_', n_features=n_features)
+
+
+class LinearSVMPathFeatureSelector(BasePathFeatureSelector):
+    """
+    L1-penalized primal linear SVM fitted over a grid of `C` values, from the smallest
+    `C` that yields a non-empty model up to `max_c_ratio` times that value.
+    """
+
+    def __init__(self, n_features=None, n_cs=30, max_c_ratio=100, n_jobs=-1, max_iter=5000):
+        super().__init__(n_features, n_jobs=n_jobs)
+        self._n_cs = n_cs
+        self._max_c_ratio = max_c_ratio
+        self._max_iter = max_iter
+
+    def _fit_path(self, X, y):
+        min_c = l1_min_c(X, y, loss='squared_hinge')
+        cs = min_c * np.geomspace(1, self._max_c_ratio, self._n_cs)
+
+        coefs = np.empty((X.shape[1], self._n_cs))
+        for i, c in enumerate(cs):
+            model = LinearSVC(C=c, penalty='l1', loss='squared_hinge', dual=False, max_iter=self._max_iter)
+            coefs[:, i] = model.fit(X, y).coef_.ravel()
+
+        return cs, coefs
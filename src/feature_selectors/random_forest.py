@@ -1,9 +1,18 @@
 from sklearn.ensemble import RandomForestClassifier
 
 
-from feature_selectors.base_models.embedded import BaseEmbeddedFeatureSelector
+from feature_selectors.base_models.replicate_trees import BaseReplicateTreesFeatureSelector
 
 
-class RandomForestFeatureSelector(BaseEmbeddedFeatureSelector):
+class RandomForestFeatureSelector(BaseReplicateTreesFeatureSelector):
     def __init__(self, n_features=None, **kwargs):
-        super().__init__(RandomForestClassifier(**kwargs), 'feature_importances_', n_features=n_features)
+        model = RandomForestClassifier(**kwargs)
+        tree_params = {p: getattr(model, p) for p in model.estimator_params}
+        super().__init__(
+            model,
+            tree_params,
+            n_features=n_features,
+            trees_per_replicate=model.n_estimators,
+            inner_bootstrap=model.bootstrap,
+            n_jobs=model.n_jobs if model.n_jobs is not None else -1
+        )
@@ -4,5 +4,13 @@ from feature_selectors.base_models.recursive_feature_elimination import RFE
 
 
 class SVMRFE(RFE):
-    def __init__(self, n_features=None, verbose=0, **kwargs):
-        super().__init__(SVC(kernel='linear', **kwargs), 'coef_', n_features=n_features, verbose=verbose)
+    def __init__(self, n_features=None, verbose=0, step=1, hybrid_threshold=None, precompute_gram=False, **kwargs):
+        super().__init__(
+            SVC(kernel='linear', **kwargs),
+            'coef_',
+            n_features=n_features,
+            verbose=verbose,
+            step=step,
+            hybrid_threshold=hybrid_threshold,
+            precompute_gram=precompute_gram
+        )
@@ -1,16 +1,23 @@
-from multiprocessing import Pool, Lock
 import os
+import shutil
+import socket
 os.environ['TF_ENABLE_ONEDNN_OPTS'] = '0'  # disables oneDNN optimizations messages
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'  # 0=all, 1=INFO, 2=WARNING, 3=ERROR
 import warnings
 from sklearn.exceptions import ConvergenceWarning, UndefinedMetricWarning
 
 from data.dataset_manager import DatasetManager
-from results.writter import ResultsWritter
+from results.writter import ResultsWritter, ResultsStreamWriter
 from task.runner import TaskRunner
 from util.shared_resources import SharedResources
 from util.command_line import get_args
 from task.task_factory import tasks_from_presets, get_datasets_from_presets
+from task.scheduler import TaskCostEstimator, TaskScheduler
+from task.checkpoint import CompletedTasks
+from task.executor import ResourceExecutor
+from task.queue import TaskQueue
+from util.thread_policy import ThreadPolicy
+from task.worker_setup import preload_datasets, preload_modules, setup_worker
 from itertools import chain
 
 from evaluation.results_prediction import ResultsScorer
@@ -19,7 +26,7 @@ from evaluation.results_execution_time import ExecutionTimesAggregator
 from data.datasets_config import datasets_relative_paths
 
 from multiprocessing import cpu_count
-from time import time
+from time import sleep, time
 warnings.filterwarnings(
     "ignore",
     message="TensorFlow GPU support is not available on native Windows.*",
@@ -34,6 +41,38 @@ ConvergenceWarning('ignore')
 UndefinedMetricWarning('ignore')
 
 
+def run_caches(results_path, selection_filename, clear):
+    """
+    Directories, `results/.<cache>/<selection file>`, where the task processes of a
+    selection file share what one of them computed: the full-data weights resampled runs
+    warm start from and the fitted knockoff factors. `clear` starts them over.
+    """
+    paths = []
+    for cache in ('warm-start', 'knockoffs'):
+        path = os.path.join(results_path, f'.{cache}', os.path.splitext(selection_filename)[0])
+        if clear and os.path.isdir(path):
+            shutil.rmtree(path)
+        paths.append(path)
+    return paths
+
+
+def make_executor(
+    num_workers, datasets, datasets_folder_path, dataset_paths, cache_dirs, pin_cores, start_method, selector_names
+):
+    if start_method == 'fork':
+        initargs = (datasets, *cache_dirs)
+    else:
+        # only forked processes inherit the datasets, the others attach or load them
+        preload_datasets(datasets_folder_path, dataset_paths)
+        initargs = (None, *cache_dirs)
+
+    return ResourceExecutor(
+        num_workers, setup_worker, initargs, ThreadPolicy(pin_cores=pin_cores), start_method,
+        # only the frameworks of the selectors that run are imported
+        preload_modules(selector_names)
+    )
+
+
 def main():
     args = get_args()
     current_timestamp = int(time())
@@ -41,21 +80,28 @@ def main():
     # configurations
     mode = args.mode
     verbose = args.verbose
-    presets = args.presets
-    presets_runs = args.presets_runs
-    num_workers = args.workers
+    # subcommands only define the arguments they use
+    presets = getattr(args, 'presets', [])
+    presets_runs = getattr(args, 'presets_runs', 1)
+    num_workers = getattr(args, 'workers', None)
 
     # paths and file names configs
     results_path = args.results_path
-    datasets_folder_path = args.datasets_path
+    datasets_folder_path = getattr(args, 'datasets_path', None)
     selection_filename = args.selection_filename
-    scoring_filename = args.scoring_filename
-    determinism_filename = args.determinism_filename
-    stability_filename = args.stability_filename
-    times_filename = args.times_filename
+    scoring_filename = getattr(args, 'scoring_filename', None)
+    determinism_filename = getattr(args, 'determinism_filename', None)
+    stability_filename = getattr(args, 'stability_filename', None)
+    times_filename = getattr(args, 'times_filename', None)
+    resume = getattr(args, 'resume', None)
+    pin_cores = getattr(args, 'pin_cores', False)
+    queue_path = getattr(args, 'queue', None)
+    lease_seconds = getattr(args, 'lease_seconds', None)
+    start_method = getattr(args, 'start_method', 'fork')
 
     # Dataset loading and shared memory preparation
-    used_datasets = get_datasets_from_presets(presets)
+    queue = TaskQueue(queue_path) if queue_path is not None else None
+    used_datasets = queue.dataset_names() if mode == 'worker' else get_datasets_from_presets(presets)
     filtered_paths = {
         name: path
         for name, path in datasets_relative_paths.items()
@@ -65,16 +111,83 @@ def main():
 
     # Feature selection stage
     if mode in ['all', 'select']:
-        # FS for classical methods
-        task_runner = TaskRunner(results_path, selection_filename, verbose=verbose)
-        with Pool(num_workers, SharedResources.set_resources, initargs=(datasets, Lock())) as pool:
-            pool.map(task_runner.run, tasks_from_presets(presets, category_filter=['classical']))
-
-        # FS for dnn-based methods
-        SharedResources.set_resources(datasets, Lock())
-        tasks = tasks_from_presets(presets, category_filter=['dnn-based'])
-        for task in tasks:
-            task_runner.run(task)
+        # an interrupted run resumes from the runs already in its results
+        completed = None
+        if resume is not None:
+            resume_path = resume or os.path.join(
+                results_path, selection_filename if selection_filename.endswith('.csv') else f'{selection_filename}.csv'
+            )
+            completed = CompletedTasks.from_path(resume_path)
+
+        # classical and dnn-based methods share the cores, each task within its thread budget
+        task_runner = TaskRunner(verbose=verbose)
+        tasks = tasks_from_presets(presets, category_filter=['classical', 'dnn-based'])
+        if completed is not None:
+            tasks = completed.pending(tasks)
+
+        # longest predicted first
+        shapes = {name: datasets.get_dataset(name).get_instances_shape() for name in datasets.names()}
+        estimator = TaskCostEstimator(TaskCostEstimator.load_history(results_path), shapes)
+        scheduler = TaskScheduler(estimator, num_workers)
+        tasks, costs = scheduler.schedule(tasks)
+
+        if queue is not None:
+            # `worker` processes on any host sharing the queue run them
+            added = queue.put(tasks, costs)
+            print(f"Enqueued {added} new tasks in {queue_path}: {queue.counts()}")
+        else:
+            # what an earlier run computed is only reused when resuming it
+            executor = make_executor(
+                num_workers, datasets, datasets_folder_path, filtered_paths,
+                run_caches(results_path, selection_filename, clear=resume is None), pin_cores, start_method,
+                {task.name for task in tasks}
+            )
+
+            # workers return their results, this process alone writes them, failed runs included
+            SharedResources.set_resources(datasets)
+            start = time()
+            with ResultsStreamWriter(selection_filename, results_path) as writer:
+                executor.run(
+                    task_runner.run,
+                    tasks,
+                    on_result=lambda task, results: writer.write(results),
+                    on_failure=lambda task, reason, time_spent: writer.write(task_runner.failed_results(task, reason, time_spent)),
+                    on_idle=writer.flush_if_due
+                )
+            scheduler.report(costs, time() - start, [executor.budget(task) for task in tasks])
+
+    # Feature selection on tasks leased from a shared queue, until it is drained
+    if mode == 'worker':
+        worker_id = f'{socket.gethostname()}-{os.getpid()}'
+        task_runner = TaskRunner(verbose=verbose)
+        # shared with the other workers of the queue, never cleared by one of them
+        executor = make_executor(
+            num_workers, datasets, datasets_folder_path, filtered_paths,
+            run_caches(results_path, selection_filename, clear=False), pin_cores, start_method,
+            queue.selector_names()
+        )
+        SharedResources.set_resources(datasets)
+
+        def complete(task, results, error=None):
+            if not queue.complete(task, worker_id, results, error):
+                print(f"Lease of task {task.name} for dataset {task.dataset_name} expired, its results were dropped")
+
+        while True:
+            executor.run(
+                task_runner.run,
+                [],
+                on_result=complete,
+                on_failure=lambda task, reason, time_spent: complete(task, task_runner.failed_results(task, reason, time_spent), reason),
+                on_idle=lambda: queue.heartbeat(worker_id, lease_seconds),
+                fetch=lambda: queue.lease(worker_id, lease_seconds)
+            )
+            # tasks leased by other workers come back if their leases expire
+            if queue.drained():
+                break
+            sleep(min(5, lease_seconds))
+
+        print(f"Queue {queue_path} drained: {queue.counts()}")
+        queue.export_results(selection_filename, results_path)
 
 
     # Scoring of a prediction after selecting most relevant features according to FS methods
@@ -21,9 +21,9 @@ class ResultsLoader:
             csv_files = [f for f in ResultsLoader._files_in_dir_tree(path) if f.endswith('.csv')]
             if not csv_files:
                 raise FileNotFoundError(f"No csv results found at {path}!")
-            return pd.concat((pd.read_csv(p) for p in csv_files), ignore_index=True)
+            return ResultsLoader._successful(pd.concat((pd.read_csv(p) for p in csv_files), ignore_index=True))
         elif path.endswith('.csv'):
-            return pd.read_csv(path)
+            return ResultsLoader._successful(pd.read_csv(path))
         else:
             raise ValueError(f"{RED_COLOR}{path} must be a CSV file or a directory containing CSVs.{DEFAULT_COLOR}", RED_COLOR)
         
@@ -55,6 +55,13 @@ class ResultsLoader:
     def load_by_name(results_path, name):
         return ResultsLoader.load_by(results_path, 'name', name)
 
+    @staticmethod
+    def _successful(df):
+        # failed runs are recorded with their status and no values
+        if 'status' in df.columns:
+            return df[df['status'].fillna('ok') == 'ok'].reset_index(drop=True)
+        return df
+
     @staticmethod    
     def _files_in_dir_tree(path):
         if not os.path.isdir(path):
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Optional
 
 
 @dataclass
@@ -13,6 +14,14 @@ class Result:
     sampling: str
     result_type: str
     values: str
+    epochs: Optional[int] = None
+    warm_start: bool = False
+    num_samples: Optional[int] = None
+    params: Optional[str] = None
+    run_index: Optional[int] = None
+    # 'ok', or why the run failed: 'timeout', 'memory', 'crashed' or 'error'
+    status: str = 'ok'
+    error: Optional[str] = None
 
     def to_dict(self):
         return self.__dict__
@@ -1,5 +1,7 @@
 import csv
 import os
+from dataclasses import fields
+from time import monotonic
 
 import pandas as pd
 
@@ -18,12 +20,48 @@ class ResultsWritter:
         elif not os.path.isdir(base_dir):
             raise NotADirectoryError(f"{RED_COLOR}{base_dir} is not a directory!{DEFAULT_COLOR}")
             
+    @staticmethod
+    def prepare_for_append(path):
+        """
+        Makes the selection CSV at `path` take rows with every `Result` field, returns
+        whether its header still has to be written.
+
+        Files written before some fields existed are rewritten with the missing columns
+        added (empty, or the field default); files with columns `Result` does not know
+        are refused rather than corrupted.
+        """
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return True
+
+        columns = [field.name for field in fields(Result)]
+        with open(path, newline='') as f:
+            header = next(csv.reader(f), [])
+        if header == columns:
+            return False
+
+        unknown = set(header) - set(columns)
+        if unknown:
+            raise ValueError(
+                f"{RED_COLOR}{path} has columns {sorted(unknown)} that are not selection results, "
+                f"refusing to append to it!{DEFAULT_COLOR}"
+            )
+
+        df = pd.read_csv(path)
+        for field in fields(Result):
+            if field.name not in df.columns:
+                df[field.name] = field.default if field.default is not None else pd.NA
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        df[columns].to_csv(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        print(f"{YELLOW_COLOR}Added the columns {[c for c in columns if c not in header]} to {path}{DEFAULT_COLOR}")
+        return False
+
     @staticmethod
     def write_result(result: Result, file_name: str, base_dir: str):
         ResultsWritter._ensure_dir(base_dir)
         df = pd.DataFrame([result.to_dict()])
         path = os.path.join(base_dir, file_name if file_name.endswith('.csv') else f"{file_name}.csv")
-        write_header = not os.path.exists(path) or os.path.getsize(path) == 0
+        write_header = ResultsWritter.prepare_for_append(path)
         df.to_csv(path, index=False, mode= 'a', header=write_header)
 
     @staticmethod
@@ -32,3 +70,51 @@ class ResultsWritter:
         file_name = file_name if file_name.endswith('.csv') else f"{file_name}.csv"
         path_to_save = os.path.join(base_dir, file_name)
         df.to_csv(path_to_save, index=False, mode='w' if replace else 'a', header=replace)
+
+
+class ResultsStreamWriter:
+    """
+    Single writer of the selection results of a run.
+
+    Workers hand their results to the process owning the writer, which buffers the rows
+    and appends them to the CSV in batches: once `batch_size` rows are waiting, or when
+    `flush_interval` seconds have passed since the last flush. Nothing has to lock the
+    file, and at most one batch is lost if the run dies.
+    """
+
+    def __init__(self, file_name: str, base_dir: str, batch_size=100, flush_interval=5.0):
+        ResultsWritter._ensure_dir(base_dir)
+        self._path = os.path.join(base_dir, file_name if file_name.endswith('.csv') else f"{file_name}.csv")
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._rows = []
+        self._last_flush = monotonic()
+        self.rows_written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+    def write(self, results):
+        self._rows.extend(result.to_dict() for result in results)
+        self.flush_if_due()
+
+    def flush_if_due(self):
+        if len(self._rows) >= self._batch_size or monotonic() - self._last_flush >= self._flush_interval:
+            self.flush()
+
+    def flush(self):
+        self._last_flush = monotonic()
+        if not self._rows:
+            return
+
+        write_header = ResultsWritter.prepare_for_append(self._path)
+        with open(self._path, 'a', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=[field.name for field in fields(Result)])
+            if write_header:
+                writer.writeheader()
+            writer.writerows(self._rows)
+        self.rows_written += len(self._rows)
+        self._rows = []
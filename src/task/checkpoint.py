@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+from collections import Counter
+
+import pandas as pd
+
+from .model import Task, params_key
+
+
+DEFAULT_COLOR = '\033[39m'
+YELLOW_COLOR = '\033[33m'
+
+FINGERPRINT_COLUMNS = ['name', 'params', 'dataset_name', 'sampling']
+# what results written before the params were recorded still tell about a run
+LEGACY_COLUMNS = ['name', 'dataset_name', 'sampling']
+
+
+def task_fingerprint(name, params, dataset_name, sampling, run_index):
+    digest = hashlib.sha1()
+    digest.update(repr((name, params_key(params), dataset_name, sampling, int(run_index))).encode())
+    return digest.hexdigest()
+
+
+def fingerprints(task: Task):
+    # a replicate task produces the rows of `replicates` consecutive runs
+    return [
+        task_fingerprint(task.name, task.params, task.dataset_name, task.sampling, task.run_index + i)
+        for i in range(task.replicates)
+    ]
+
+
+class CompletedTasks:
+    """
+    Fingerprints of the runs already present in selection results, used to resume an
+    interrupted selection stage.
+
+    A run is identified by its algorithm, params, dataset, sampling and run index. Rows
+    written before the run index was recorded get theirs from their order in the file.
+    Rows written before the params were recorded are matched by position instead: the
+    k-th such row of an algorithm, dataset and sampling stands for the k-th run of them
+    in preset order.
+    """
+
+    def __init__(self, done=None, legacy=None):
+        self._done = set(done or [])
+        self._legacy = Counter(legacy or {})
+
+    def __len__(self):
+        return len(self._done)
+
+    @staticmethod
+    def _csv_paths(path):
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    if name.endswith('.csv'):
+                        yield os.path.join(root, name)
+        elif os.path.exists(path):
+            yield path
+
+    @staticmethod
+    def _successful(df):
+        # failed runs are attempted again
+        if 'status' in df.columns:
+            return df[df['status'].fillna('ok') == 'ok']
+        return df
+
+    @staticmethod
+    def _legacy_counts(df):
+        if not set(LEGACY_COLUMNS).issubset(df.columns):
+            return Counter()
+        if 'params' in df.columns:
+            df = df[df['params'].isna()]
+        df = CompletedTasks._successful(df)
+        return Counter(zip(df['name'], df['dataset_name'], df['sampling']))
+
+    @staticmethod
+    def _row_fingerprints(df):
+        if not set(FINGERPRINT_COLUMNS).issubset(df.columns):
+            return []
+        df = CompletedTasks._successful(df.dropna(subset=['params']))
+        run_index = df['run_index'] if 'run_index' in df.columns else pd.Series(index=df.index, dtype=float)
+        # numbering the legacy rows of each run configuration in the order they were written
+        run_index = run_index.fillna(df.groupby(FINGERPRINT_COLUMNS).cumcount())
+        return [
+            task_fingerprint(name, json.loads(params), dataset_name, sampling, index)
+            for name, params, dataset_name, sampling, index
+            in zip(df['name'], df['params'], df['dataset_name'], df['sampling'], run_index)
+        ]
+
+    @classmethod
+    def from_path(cls, path):
+        """
+        Collects the completed runs of a selection CSV, or of every selection CSV in a directory.
+        """
+        done, legacy = set(), Counter()
+        for csv_path in cls._csv_paths(path):
+            try:
+                df = pd.read_csv(csv_path)
+            except Exception:
+                continue
+            done.update(cls._row_fingerprints(df))
+            legacy.update(cls._legacy_counts(df))
+        return cls(done, legacy)
+
+    def is_done(self, task: Task):
+        return all(fingerprint in self._done for fingerprint in fingerprints(task))
+
+    def pending(self, tasks):
+        """
+        The `tasks`, in preset order, whose runs are not all in the results yet.
+        """
+        legacy = self._legacy.copy()
+        pending, matched_by_position = [], 0
+        for task in tasks:
+            if self.is_done(task):
+                continue
+            key = (task.name, task.dataset_name, task.sampling)
+            if legacy[key] >= task.replicates:
+                legacy[key] -= task.replicates
+                matched_by_position += 1
+                continue
+            pending.append(task)
+
+        print(
+            f"{YELLOW_COLOR}Resuming {len(pending)} tasks, skipped {len(tasks) - len(pending)} "
+            f"already completed{DEFAULT_COLOR}"
+        )
+        if matched_by_position:
+            print(
+                f"{YELLOW_COLOR}{matched_by_position} of them were matched by position to results that do not "
+                f"record their params, check that those results come from the same presets{DEFAULT_COLOR}"
+            )
+        return pending
@@ -0,0 +1,274 @@
+import importlib
+import multiprocessing
+import multiprocessing.connection
+import os
+import sys
+from time import monotonic
+
+from util.thread_policy import ThreadPolicy, available_cores
+
+
+DEFAULT_COLOR = '\033[39m'
+RED_COLOR = "\033[31m"
+YELLOW_COLOR = '\033[33m'
+
+
+def _entry(fn, task, cores, thread_policy, initializer, initargs, connection):
+    if initializer is not None:
+        initializer(*initargs)
+    if thread_policy is not None:
+        thread_policy.apply(cores=cores)
+    try:
+        connection.send((True, fn(task)))
+    except Exception as e:
+        connection.send((False, f"error: {type(e).__name__}: {e}"))
+    connection.close()
+
+
+def _children(pid):
+    children = []
+    try:
+        for tid in os.listdir(f'/proc/{pid}/task'):
+            with open(f'/proc/{pid}/task/{tid}/children') as f:
+                children.extend(int(child) for child in f.read().split())
+    except OSError:
+        pass
+    return children
+
+
+def _private_rss_kb(pid):
+    # pages still shared with the forking parent (libraries, datasets) are not the task's
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            return sum(int(line.split()[1]) for line in f if line.startswith(('Private_Clean:', 'Private_Dirty:')))
+    except OSError:
+        pass
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+    return 0
+
+
+def tree_rss(pid):
+    """
+    Resident memory in MB private to process `pid` and its descendants (e.g.
+    data-parallel ranks), read from /proc; None where /proc is not available.
+    """
+    if not os.path.exists(f'/proc/{pid}/status'):
+        return None
+
+    rss_kb, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        try:
+            rss_kb += _private_rss_kb(current)
+        except OSError:
+            continue
+        stack.extend(_children(current))
+    return rss_kb / 1024
+
+
+class ResourceExecutor:
+    """
+    Runs tasks in forked processes, packing them onto `num_cores` cores by thread budget.
+
+    Every task declares how many cores it uses (`task.threads`, e.g. 1 for a classical
+    filter and several for a NN selector) and its process applies `thread_policy` with
+    that budget, capping the BLAS/OpenMP, joblib, torch and TensorFlow thread pools and,
+    when the policy pins cores, binding the process to the cores it was given. Without
+    a policy the task's libraries pick their own thread counts.
+
+    Tasks are started in the given order as soon as enough cores are free; when the next
+    task does not fit, later smaller ones fill the gap. Each task gets a fresh process, so
+    NN tasks can themselves fork data-parallel ranks and TensorFlow is configured before
+    its first op, and a task that crashes or is killed takes no other task with it.
+
+    Task processes are forked from this process by default, which imports the `preload`
+    modules first so that no task imports them again. With `start_method='forkserver'`
+    they are forked from a server that imported the `preload` modules once, so they start
+    warm even when this process keeps its imports light; `fn`, the tasks and `initargs`
+    are then pickled and must not hold inherited-only objects.
+
+    Resampled runs of warm-starting selectors wait for the full-data run they start from.
+
+    Besides the given `tasks`, the executor pulls more from `fetch()` (e.g. a shared
+    queue) whenever it has no pending task and free cores, until `fetch` returns None.
+
+    What `fn` returns is sent back to the parent and handed to `on_result(task, value)`,
+    so a single writer there can store the results of every task. `on_idle` is called at least every
+    `idle_interval` seconds while tasks run, e.g. to flush that writer on time.
+
+    A task running longer than `task.timeout` seconds, or whose processes use more than
+    `task.max_memory` MB of resident memory, is killed. Killed, crashed and raising tasks
+    are started again up to `task.retries` times, then reported to
+    `on_failure(task, reason, time_spent)`. Limits are checked every `idle_interval`.
+    """
+
+    def __init__(
+        self, num_cores, initializer=None, initargs=(), thread_policy=ThreadPolicy(), start_method='fork', preload=()
+    ):
+        self._num_cores = max(1, num_cores)
+        self._thread_policy = thread_policy
+        # more slots than cores (oversubscription) wrap around the available cores
+        cores = available_cores()
+        self._cores = [cores[i % len(cores)] for i in range(self._num_cores)]
+        self._initializer = initializer
+        self._initargs = initargs
+        self._context = multiprocessing.get_context(start_method)
+        if start_method == 'forkserver' and preload:
+            self._context.set_forkserver_preload(list(preload))
+            # the server does not apply the sys.path it is sent (before python 3.12) and
+            # silently skips modules it cannot import, so it gets ours from the environment
+            paths = [path for path in sys.path if path] + os.environ.get('PYTHONPATH', '').split(os.pathsep)
+            os.environ['PYTHONPATH'] = os.pathsep.join(dict.fromkeys(path for path in paths if path))
+        elif start_method == 'fork':
+            for module in preload:
+                importlib.import_module(module)
+
+    def budget(self, task):
+        return max(1, min(getattr(task, 'threads', 1), self._num_cores))
+
+    @staticmethod
+    def _warm_start_key(task):
+        # decided from the spec, the selector itself is only built in the task process
+        if task.selector_info.supports_warm_start and task.selector_param('warm_start'):
+            return task.warm_start_source()
+        return None
+
+    @staticmethod
+    def _kill(process):
+        # data-parallel ranks forked by the task die with it
+        for child in _children(process.pid):
+            try:
+                os.kill(child, 9)
+            except OSError:
+                pass
+        process.kill()
+
+    def _limit_exceeded(self, process, task, started):
+        timeout = getattr(task, 'timeout', None)
+        if timeout is not None and monotonic() - started > timeout:
+            return f"timeout: exceeded {timeout}s"
+
+        max_memory = getattr(task, 'max_memory', None)
+        if max_memory is not None:
+            rss = tree_rss(process.pid)
+            if rss is not None and rss > max_memory:
+                return f"memory: {rss:.0f}MB exceeded {max_memory}MB"
+        return None
+
+    def run(self, fn, tasks, on_result=None, on_failure=None, on_idle=None, idle_interval=1.0, fetch=None):
+        pending = []
+        # full-data runs that resampled warm-started runs have to wait for
+        full_data = {}
+
+        def add(task):
+            pending.append(task)
+            key = self._warm_start_key(task)
+            if key is not None and task.sampling == 'none':
+                full_data[key] = full_data.get(key, 0) + 1
+
+        for task in tasks:
+            add(task)
+
+        running = {}
+        attempts = {}
+        free_cores = list(self._cores)
+        failed = 0
+
+        while True:
+            while fetch is not None and not pending and free_cores:
+                task = fetch()
+                if task is None:
+                    break
+                add(task)
+            if not pending and not running:
+                break
+
+            for task in list(pending):
+                key = self._warm_start_key(task)
+                if task.sampling != 'none' and full_data.get(key):
+                    continue
+                budget = self.budget(task)
+                if budget > len(free_cores):
+                    continue
+
+                cores, free_cores = free_cores[:budget], free_cores[budget:]
+                reader, writer = self._context.Pipe(duplex=False)
+                process = self._context.Process(
+                    target=_entry, args=(fn, task, cores, self._thread_policy, self._initializer, self._initargs, writer)
+                )
+                process.start()
+                writer.close()
+                running[process.sentinel] = [process, task, cores, reader, monotonic(), None]
+                attempts[id(task)] = attempts.get(id(task), 0) + 1
+                pending.remove(task)
+                if not free_cores:
+                    break
+
+            if not running:
+                # only possible when a waited-on full-data run never existed
+                full_data.clear()
+                continue
+
+            readers = {entry[3]: entry for entry in running.values() if entry[3] is not None}
+            ready = multiprocessing.connection.wait(list(running) + list(readers), timeout=idle_interval)
+            if on_idle is not None:
+                on_idle()
+
+            # results are read before exits are handled, a child blocked sending a large
+            # result only exits once it is read
+            for reader in [r for r in ready if r in readers]:
+                entry = readers[reader]
+                entry[3] = None
+                try:
+                    entry[5] = reader.recv()
+                except EOFError:
+                    pass
+                finally:
+                    reader.close()
+
+            # runaway tasks are killed, their exit is handled like any other
+            for entry in running.values():
+                process, task, _, _, started, outcome = entry
+                reason = self._limit_exceeded(process, task, started) if outcome is None else None
+                if reason is not None:
+                    self._kill(process)
+                    entry[5] = (False, reason)
+
+            for sentinel in [s for s in list(running) if not running[s][0].is_alive()]:
+                process, task, cores, reader, started, outcome = running[sentinel]
+                if reader is not None:
+                    # a result sent just before exiting is still in the pipe
+                    if reader.poll():
+                        try:
+                            outcome = outcome or reader.recv()
+                        except EOFError:
+                            pass
+                    reader.close()
+                running.pop(sentinel)
+                process.join()
+                free_cores += cores
+
+                if outcome is None:
+                    outcome = (False, f"crashed: exit code {process.exitcode}")
+                succeeded, value = outcome
+                if succeeded:
+                    if on_result is not None:
+                        on_result(task, value)
+                elif attempts[id(task)] <= getattr(task, 'retries', 0):
+                    print(f"{YELLOW_COLOR}Retrying task {task.name} for dataset {task.dataset_name} ({value}){DEFAULT_COLOR}")
+                    pending.insert(0, task)
+                    continue
+                else:
+                    failed += 1
+                    print(f"{RED_COLOR}Task {task.name} for dataset {task.dataset_name} failed ({value}){DEFAULT_COLOR}")
+                    if on_failure is not None:
+                        on_failure(task, value, monotonic() - started)
+
+                key = self._warm_start_key(task)
+                if key is not None and task.sampling == 'none':
+                    full_data[key] -= 1
+
+        return failed
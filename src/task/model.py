@@ -1,17 +1,121 @@
+import inspect
+import json
+
+from feature_selectors import feature_selectors
 from feature_selectors.base_models.base_selector import BaseSelector
 
 
+def params_key(params):
+    return json.dumps(params, sort_keys=True)
+
+
+def make_selector(name, params, seed=None):
+    """
+    Instantiates the registered selector `name`; `params` are positional arguments, or
+    keyword arguments when given as an object. `seed` is passed to selectors that take one
+    unless the params already set it.
+    """
+    selector_class = feature_selectors[name]
+    kwargs = {}
+    if seed is not None and 'seed' in inspect.signature(selector_class).parameters:
+        if not (isinstance(params, dict) and 'seed' in params):
+            kwargs['seed'] = seed
+
+    if isinstance(params, dict):
+        return selector_class(**params, **kwargs)
+    return selector_class(*params, **kwargs)
+
+
 class Task():
+    """
+    Specification of one selection run, cheap to build and to pickle.
+
+    The feature selector is only instantiated, from `name`, `params` and `seed`, the first
+    time `feature_selector` is accessed, i.e. in the worker that runs the task; it is
+    never pickled along with the spec.
+    """
+
     def __init__(
         self,
         name: str,
-        feature_selector: BaseSelector,
         dataset_name: str,
         n_informative: int,
-        sampling: str = 'none'
+        sampling: str = 'none',
+        replicates: int = 1,
+        data_parallel: int = 1,
+        params=None,
+        run_index: int = 0,
+        threads: int = 1,
+        seed=None,
+        timeout=None,
+        max_memory=None,
+        retries: int = 0
     ):
         self.name = name
-        self.feature_selector = feature_selector
         self.dataset_name = dataset_name
         self.n_informative = n_informative
         self.sampling = sampling
+        self.replicates = replicates
+        self.data_parallel = data_parallel
+        self.params = params if params is not None else []
+        # position among the runs of the same algorithm, params, dataset and sampling
+        self.run_index = run_index
+        # cores the task may use, see `ResourceExecutor`
+        self.threads = threads
+        self.seed = seed
+        # limits in seconds and MB of resident memory, and attempts after a failure
+        self.timeout = timeout
+        self.max_memory = max_memory
+        self.retries = retries
+        self._feature_selector = None
+
+    @property
+    def selector_class(self):
+        return feature_selectors[self.name]
+
+    @property
+    def selector_info(self):
+        # what the registry knows about the selector without importing it
+        return feature_selectors.info(self.name)
+
+    @property
+    def feature_selector(self) -> BaseSelector:
+        if self._feature_selector is None:
+            self._feature_selector = make_selector(self.name, self.params, self.seed)
+        return self._feature_selector
+
+    def selector_param(self, param):
+        """
+        Value the selector will get for the constructor parameter `param`, without building
+        or importing it; only the parameters the registry describes can be read.
+        """
+        return feature_selectors.spec_param(self.name, self.params, param)
+
+    def warm_start_source(self):
+        """
+        Identifies the full-data run that resampled runs of the same algorithm, params and
+        dataset warm start from: the first one, with the seed it runs with. The other
+        full-data runs are no source and get None.
+        """
+        if self.sampling == 'none' and self.run_index != 0:
+            return None
+        # runs are seeded seed, seed + 1, ... so the first one has the seed of run 0
+        seed = self.seed - self.run_index if self.seed is not None else None
+        return self.name, self.dataset_name, params_key(self.params), seed
+
+    SPEC_FIELDS = (
+        'name', 'dataset_name', 'n_informative', 'sampling', 'replicates', 'data_parallel',
+        'params', 'run_index', 'threads', 'seed', 'timeout', 'max_memory', 'retries'
+    )
+
+    def to_spec(self):
+        return {field: getattr(self, field) for field in self.SPEC_FIELDS}
+
+    @classmethod
+    def from_spec(cls, spec):
+        return cls(**spec)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_feature_selector'] = None
+        return state
@@ -0,0 +1,190 @@
+import csv
+import json
+import os
+import sqlite3
+from dataclasses import fields
+from time import time
+
+from results.model import Result
+from .checkpoint import fingerprints
+from .model import Task
+
+
+DEFAULT_COLOR = '\033[39m'
+YELLOW_COLOR = '\033[33m'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    fingerprint TEXT UNIQUE NOT NULL,
+    spec TEXT NOT NULL,
+    cost REAL NOT NULL DEFAULT 0,
+    state TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, cost);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    task_id INTEGER NOT NULL,
+    row TEXT NOT NULL
+);
+"""
+
+
+class TaskQueue:
+    """
+    Task queue in a SQLite file on a filesystem shared by the workers of a run.
+
+    Tasks are stored as JSON specs (see `Task.to_spec`) and identified by the
+    fingerprint of their runs, so enqueueing the same presets twice adds nothing. A
+    worker leases the most expensive pending task for `lease_seconds` and keeps its
+    leases alive with `heartbeat`; leases of workers that stopped heart-beating expire
+    and their tasks go back to pending, or fail once they were leased more than
+    `retries + 1` times. A task is completed together with its result rows in one
+    transaction, and only by the worker still holding its lease, so every task's rows
+    are stored exactly once.
+    """
+
+    def __init__(self, path, timeout=60.0):
+        self._path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # autocommit mode, transactions are opened explicitly with BEGIN IMMEDIATE
+        self._connection = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self._connection.executescript(SCHEMA)
+        self._last_heartbeat = 0.0
+
+    def close(self):
+        self._connection.close()
+
+    def _transaction(self):
+        connection = self._connection
+
+        class Transaction:
+            def __enter__(self):
+                connection.execute('BEGIN IMMEDIATE')
+                return connection
+
+            def __exit__(self, exc_type, *exc):
+                connection.execute('ROLLBACK' if exc_type else 'COMMIT')
+
+        return Transaction()
+
+    @staticmethod
+    def task_fingerprint(task: Task):
+        runs = fingerprints(task)
+        return runs[0] if len(runs) == 1 else f'{runs[0]}x{len(runs)}'
+
+    def put(self, tasks, costs=None):
+        """
+        Enqueues the tasks not already in the queue; returns how many were added.
+        """
+        costs = costs if costs is not None else [0.0] * len(tasks)
+        with self._transaction() as connection:
+            before = connection.total_changes
+            connection.executemany(
+                'INSERT OR IGNORE INTO tasks (fingerprint, spec, cost) VALUES (?, ?, ?)',
+                [(self.task_fingerprint(task), json.dumps(task.to_spec()), cost) for task, cost in zip(tasks, costs)]
+            )
+            return connection.total_changes - before
+
+    def _expire_leases(self, connection, now):
+        expired = connection.execute(
+            "SELECT id, spec, attempts FROM tasks WHERE state = 'leased' AND lease_expires < ?", (now,)
+        ).fetchall()
+        for task_id, spec, attempts in expired:
+            # the lost worker costs the task one attempt more than its own retries allow
+            retries = json.loads(spec).get('retries') or 0
+            if attempts > retries + 1:
+                connection.execute(
+                    "UPDATE tasks SET state = 'failed', worker = NULL, error = 'crashed: lease expired' WHERE id = ?",
+                    (task_id,)
+                )
+            else:
+                connection.execute("UPDATE tasks SET state = 'pending', worker = NULL WHERE id = ?", (task_id,))
+
+    def lease(self, worker, lease_seconds):
+        """
+        Leases the most expensive pending task to `worker`; returns it, or None.
+        The task's `queue_id` is needed to complete it.
+        """
+        now = time()
+        with self._transaction() as connection:
+            self._expire_leases(connection, now)
+            row = connection.execute(
+                "SELECT id, spec FROM tasks WHERE state = 'pending' ORDER BY cost DESC, id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+
+            task_id, spec = row
+            connection.execute(
+                "UPDATE tasks SET state = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1 WHERE id = ?",
+                (worker, now + lease_seconds, task_id)
+            )
+
+        task = Task.from_spec(json.loads(spec))
+        task.queue_id = task_id
+        return task
+
+    def heartbeat(self, worker, lease_seconds):
+        # a few renewals per lease period keep a live worker's leases without writing constantly
+        if time() - self._last_heartbeat < lease_seconds / 4:
+            return
+        self._last_heartbeat = time()
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE tasks SET lease_expires = ? WHERE worker = ? AND state = 'leased'",
+                (time() + lease_seconds, worker)
+            )
+
+    def complete(self, task: Task, worker, results, error=None):
+        """
+        Stores the result rows of a leased task and marks it done, or failed when `error`
+        is given. Returns False, storing nothing, when `worker` lost the lease meanwhile.
+        """
+        with self._transaction() as connection:
+            updated = connection.execute(
+                "UPDATE tasks SET state = ?, worker = NULL, error = ? WHERE id = ? AND worker = ? AND state = 'leased'",
+                ('failed' if error else 'done', error, task.queue_id, worker)
+            ).rowcount
+            if not updated:
+                return False
+            connection.executemany(
+                'INSERT INTO results (task_id, row) VALUES (?, ?)',
+                [(task.queue_id, json.dumps(result.to_dict())) for result in results]
+            )
+        return True
+
+    def counts(self):
+        rows = self._connection.execute('SELECT state, COUNT(*) FROM tasks GROUP BY state').fetchall()
+        return dict(rows)
+
+    def drained(self):
+        counts = self.counts()
+        return not counts.get('pending') and not counts.get('leased')
+
+    def dataset_names(self):
+        return {json.loads(spec)['dataset_name'] for spec, in self._connection.execute('SELECT spec FROM tasks')}
+
+    def selector_names(self):
+        return {json.loads(spec)['name'] for spec, in self._connection.execute('SELECT spec FROM tasks')}
+
+    def export_results(self, file_name, base_dir):
+        """
+        Writes every stored result row to the selection CSV, replacing it atomically.
+        """
+        os.makedirs(base_dir, exist_ok=True)
+        path = os.path.join(base_dir, file_name if file_name.endswith('.csv') else f"{file_name}.csv")
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=[field.name for field in fields(Result)])
+            writer.writeheader()
+            for row, in self._connection.execute('SELECT row FROM results ORDER BY id'):
+                writer.writerow(json.loads(row))
+        os.replace(tmp_path, path)
+        print(f"{YELLOW_COLOR}Exported the queue results to {path}{DEFAULT_COLOR}")
+        return path
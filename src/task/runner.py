@@ -2,8 +2,7 @@ import json
 from time import time
 import traceback
 
-from data.sampling import bootstrap, percent90
-from results.writter import ResultsWritter
+from data.sampling import bootstrap, percent90, sampling_indices
 from results.model import Result
 from feature_selectors.base_models import ResultType
 from .model import Task
@@ -18,82 +17,149 @@ YELLOW_COLOR = '\033[33m'
 
 
 class TaskRunner():
-    def __init__(self, results_path, output_file_name, verbose=1):
-        self._results_path = results_path
+    """
+    Runs a task and returns its results; writing them is left to the caller, e.g. a single
+    `ResultsStreamWriter` fed by all workers.
+    """
+
+    def __init__(self, verbose=1):
         self._verbose = verbose
-        self._output_file_name = output_file_name
 
     def _log(self, msg, color=DEFAULT_COLOR, level=1):
         if self._verbose >= level:
             print(f"{color}{msg}{DEFAULT_COLOR}")
 
+    def _informative_counts(self, result_type, values, k):
+        # Determine feature ordering / selection indices
+        if result_type is ResultType.WEIGHTS:
+            # sort features by absolute weight descending
+            ordered_features = sorted(range(len(values)), key=lambda i: abs(values[i]), reverse=True)
+        elif result_type is ResultType.RANK:
+            # rank already gives top features first
+            ordered_features = [int(v) for v in values]
+        else:
+            # selected mask: just take the selected features in order (could also sort by index)
+            ordered_features = [int(v) for v in values]
+
+        # Count how many informative features are selected in top k features
+        selected_informative_k = sum(1 for f in ordered_features[:k] if f < k)
+
+        # Count how many informative features are selected in top 2k features
+        selected_informative_2k = sum(1 for f in ordered_features[:2*k] if f < k)
+
+        return selected_informative_k, selected_informative_2k
+
+    def _build_result(self, task, dataset, fs, values, time_spent, replicate=0):
+        num_selected = task.feature_selector._n_features
+        num_samples, num_features = dataset.get_instances_shape()[:2]
+
+        # Number of informative features
+        k = task.n_informative
+        selected_informative_k, selected_informative_2k = self._informative_counts(fs.result_type, values, k)
+
+        return Result(
+            name=task.name,
+            processing_time=time_spent,
+            dataset_name=dataset.name,
+            selected_informative_k=selected_informative_k,
+            selected_informative_2k=selected_informative_2k,
+            num_features=num_features,
+            num_selected=num_selected if num_selected else num_features,
+            sampling=task.sampling,
+            result_type=fs.result_type.value,
+            values=json.dumps(values),
+            epochs=fs.get_epochs(),
+            warm_start=fs.is_warm_started(),
+            num_samples=num_samples,
+            params=json.dumps(task.params),
+            run_index=task.run_index + replicate
+        )
+
+    def failed_results(self, task, reason, time_spent):
+        """
+        Rows recording that every run of `task` failed; `reason` starts with the status.
+        """
+        dataset = SharedResources.get()['datasets'].get_dataset(task.dataset_name)
+        num_samples, num_features = dataset.get_instances_shape()[:2]
+        num_selected = task.selector_param('n_features')
+
+        return [
+            Result(
+                name=task.name,
+                processing_time=time_spent,
+                dataset_name=task.dataset_name,
+                selected_informative_k=0,
+                selected_informative_2k=0,
+                num_features=num_features,
+                num_selected=num_selected if num_selected else num_features,
+                sampling=task.sampling,
+                result_type=task.selector_info.result_type.value,
+                values=json.dumps([]),
+                num_samples=num_samples,
+                params=json.dumps(task.params),
+                run_index=task.run_index + replicate,
+                status=reason.split(':')[0],
+                error=reason
+            )
+            for replicate in range(task.replicates)
+        ]
+
+    def _run_replicates(self, task, X, y):
+        fs = task.feature_selector
+        index_sets = [sampling_indices(task.sampling, X.shape[0]) for _ in range(task.replicates)]
+        fit_params = {'warm_start_source': task.warm_start_source(), 'sampling': task.sampling} if fs.supports_warm_start else {}
+
+        start = time()
+        fs.fit_replicates(X, y, task.n_informative, index_sets, **fit_params)
+        time_spent = time() - start
+
+        # the single fit is amortized over the replicates it produced
+        return [list(weights) for weights in fs.get_replicate_weights()], time_spent / task.replicates
+
     def run(self, task: Task):
         self._log(f"Starting task {task.name} for dataset {task.dataset_name}", CYAN_COLOR)
         try:
-            shared_resources = SharedResources.get()
-            datasets, lock = shared_resources['datasets'], shared_resources['lock']
-            
+            datasets = SharedResources.get()['datasets']
+
             dataset = datasets.get_dataset(task.dataset_name)
             X, y = dataset.get_instances(), dataset.get_classes()
 
-            if task.sampling == 'bootstrap': 
-                X, y = bootstrap(X, y)
-            elif task.sampling == 'percent90':
-                X, y = percent90(X, y)
-
             fs = task.feature_selector
 
-            start = time()
-            fs.fit(X, y, task.n_informative)
-            time_spent = time() - start
-
-            if fs.result_type is ResultType.WEIGHTS:
-                values = list(fs.get_weights())
-            elif fs.result_type is ResultType.RANK:
-                values = [int(v) for v in fs.get_rank()]
+            if task.replicates > 1:
+                replicate_values, time_spent = self._run_replicates(task, X, y)
+                results = [
+                    self._build_result(task, dataset, fs, values, time_spent, replicate)
+                    for replicate, values in enumerate(replicate_values)
+                ]
             else:
-                values = [int(v) for v in fs.get_selected()]
-
-            num_selected = task.feature_selector._n_features
-            num_features = dataset.get_instances_shape()[1]
-
-            # Determine feature ordering / selection indices
-            if fs.result_type is ResultType.WEIGHTS:
-                # sort features by absolute weight descending
-                ordered_features = sorted(range(len(values)), key=lambda i: abs(values[i]), reverse=True)
-            elif fs.result_type is ResultType.RANK:
-                # rank already gives top features first
-                ordered_features = [int(v) for v in values]
-            else:
-                # selected mask: just take the selected features in order (could also sort by index)
-                ordered_features = [int(v) for v in values]
+                if task.sampling == 'bootstrap': 
+                    X, y = bootstrap(X, y)
+                elif task.sampling == 'percent90':
+                    X, y = percent90(X, y)
 
-            # Number of informative features
-            k = task.n_informative
+                # warm-startable selectors need to know which full-data fit they resample
+                fit_params = {'warm_start_source': task.warm_start_source(), 'sampling': task.sampling} if fs.supports_warm_start else {}
+                if task.data_parallel > 1 and fs.supports_data_parallel:
+                    fit_params['n_procs'] = task.data_parallel
 
-            # Count how many informative features are selected in top k features
-            selected_informative_k = sum(1 for f in ordered_features[:k] if f < k)
+                start = time()
+                fs.fit(X, y, task.n_informative, **fit_params)
+                time_spent = time() - start
 
-            # Count how many informative features are selected in top 2k features
-            selected_informative_2k = sum(1 for f in ordered_features[:2*k] if f < k)
+                if fs.result_type is ResultType.WEIGHTS:
+                    values = list(fs.get_weights())
+                elif fs.result_type is ResultType.RANK:
+                    values = [int(v) for v in fs.get_rank()]
+                else:
+                    values = [int(v) for v in fs.get_selected()]
 
-            result = Result(
-                name=task.name,
-                processing_time=time_spent,
-                dataset_name=dataset.name,
-                selected_informative_k=selected_informative_k,
-                selected_informative_2k=selected_informative_2k,
-                num_features=num_features,
-                num_selected=num_selected if num_selected else num_features,
-                sampling=task.sampling,
-                result_type=fs.result_type.value,
-                values=json.dumps(values)
-            )
+                results = [self._build_result(task, dataset, fs, values, time_spent)]
+
+            self._log(f"Task {task.name} done! [{time_spent * task.replicates:.2f}s]", GREEN_COLOR)
+            return results
 
-            with lock:
-                ResultsWritter.write_result(result, self._output_file_name, self._results_path)
-                self._log(f"Task {task.name} done! [{time_spent:.2f}s]", GREEN_COLOR)
-            
         except Exception as e:
             self._log(f"Error in task {task.name} for dataset {task.dataset_name}: {e}", RED_COLOR, level=0)
-            self._log(traceback.format_exc(limit=5), RED_COLOR, level=1)
\ No newline at end of file
+            self._log(traceback.format_exc(limit=5), RED_COLOR, level=1)
+            raise
\ No newline at end of file
@@ -0,0 +1,167 @@
+import heapq
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .model import Task, params_key
+
+
+DEFAULT_COLOR = '\033[39m'
+YELLOW_COLOR = '\033[33m'
+
+HISTORY_COLUMNS = {'name', 'dataset_name', 'num_features', 'processing_time'}
+
+
+class TaskCostEstimator:
+    """
+    Predicts how long a task takes from the `processing_time` of earlier selection results.
+
+    A task is matched, in order, against past runs of the same algorithm and params on the
+    same dataset, then against the same algorithm (same params first) on other datasets,
+    rescaled by the size heuristic. Without any matching history the size heuristic is
+    used alone, calibrated to seconds on whatever history exists.
+
+    Only successful runs count as history: a failed run's `processing_time` is when it
+    crashed or was killed. A run killed on timeout still ran at least that long, so the
+    estimate of the same algorithm, params and dataset never goes below it.
+    """
+
+    def __init__(self, history=None, shapes=None):
+        self._shapes = shapes or {}
+        history = self._prepare(history if history is not None else pd.DataFrame(columns=list(HISTORY_COLUMNS)))
+        self._history = history[history['status'] == 'ok']
+        self._timeouts = history[history['status'] == 'timeout']
+        self._scale = self._calibrate()
+
+    @staticmethod
+    def load_history(results_path):
+        """
+        Concatenates every selection CSV found under `results_path`; other CSVs are skipped.
+        """
+        frames = []
+        if os.path.isdir(results_path):
+            for root, _, files in os.walk(results_path):
+                for name in files:
+                    if not name.endswith('.csv'):
+                        continue
+                    try:
+                        df = pd.read_csv(os.path.join(root, name))
+                    except Exception:
+                        continue
+                    if HISTORY_COLUMNS.issubset(df.columns):
+                        frames.append(df)
+        return pd.concat(frames, ignore_index=True) if frames else None
+
+    def _prepare(self, history):
+        history = history.copy()
+        if 'num_samples' not in history.columns:
+            history['num_samples'] = np.nan
+        if 'params' not in history.columns:
+            history['params'] = None
+        # results written before failures were recorded only hold successful runs
+        history['status'] = history['status'].fillna('ok') if 'status' in history.columns else 'ok'
+        # older results do not record the sample count, the loaded dataset knows it
+        known = history['dataset_name'].map(lambda d: self._shapes.get(d, (np.nan,))[0])
+        history['num_samples'] = history['num_samples'].fillna(known)
+        history['params'] = history['params'].map(lambda p: params_key(json.loads(p)) if isinstance(p, str) else None)
+        return history.dropna(subset=['processing_time'])
+
+    @staticmethod
+    def _size(selector_info, n_samples, n_features):
+        # wrappers refit a model for every eliminated or added feature
+        if selector_info.wrapper:
+            return n_samples * n_features ** 2
+        return n_samples * n_features
+
+    @property
+    def calibrated(self):
+        # without history the size heuristic only orders tasks, it does not predict seconds
+        return self._scale is not None
+
+    def _calibrate(self):
+        history = self._history.dropna(subset=['num_samples'])
+        if history.empty:
+            return None
+        sizes = history['num_samples'] * history['num_features']
+        return float(np.median(history['processing_time'] / sizes))
+
+    def _task_shape(self, task):
+        return self._shapes.get(task.dataset_name)
+
+    def estimate(self, task: Task):
+        timeouts = self._timeouts[
+            (self._timeouts['name'] == task.name) & (self._timeouts['dataset_name'] == task.dataset_name)
+            & (self._timeouts['params'] == params_key(task.params))
+        ]
+        lower_bound = float(timeouts['processing_time'].max()) * task.replicates if not timeouts.empty else 0.0
+        return max(self._estimate(task), lower_bound)
+
+    def _estimate(self, task: Task):
+        history = self._history[self._history['name'] == task.name]
+        key = params_key(task.params)
+        shape = self._task_shape(task)
+
+        same_params = history[history['params'] == key]
+        exact = same_params[same_params['dataset_name'] == task.dataset_name]
+        if not exact.empty:
+            return float(exact['processing_time'].median()) * task.replicates
+
+        if shape is None:
+            return float(history['processing_time'].median()) * task.replicates if not history.empty else 0.0
+
+        size = self._size(task.selector_info, *shape)
+        for candidates in (same_params, history):
+            candidates = candidates.dropna(subset=['num_samples'])
+            if not candidates.empty:
+                sizes = [self._size(task.selector_info, n, f) for n, f in zip(candidates['num_samples'], candidates['num_features'])]
+                return float(np.median(candidates['processing_time'] / np.array(sizes))) * size * task.replicates
+
+        return (self._scale or 1.0) * size * task.replicates
+
+
+class TaskScheduler:
+    """
+    Orders tasks longest-first by predicted cost, so the long ones do not start last and
+    leave the run waiting on a few cores, and reports predicted versus actual makespan.
+    """
+
+    def __init__(self, estimator: TaskCostEstimator, num_workers):
+        self._estimator = estimator
+        self._num_workers = num_workers
+
+    def schedule(self, tasks):
+        costs = [self._estimator.estimate(task) for task in tasks]
+        order = sorted(range(len(tasks)), key=lambda i: costs[i], reverse=True)
+        return [tasks[i] for i in order], [costs[i] for i in order]
+
+    def predicted_makespan(self, costs, budgets=None):
+        """
+        Simulates starting the tasks in order on `num_workers` cores, each task holding
+        `budgets[i]` cores (1 by default) until it finishes.
+        """
+        budgets = [min(b, self._num_workers) for b in budgets] if budgets else [1] * len(costs)
+        clock, free, finishing = 0.0, self._num_workers, []
+        for cost, budget in zip(costs, budgets):
+            while free < budget:
+                clock, released = heapq.heappop(finishing)
+                free += released
+            heapq.heappush(finishing, (clock + cost, budget))
+            free -= budget
+        return max(end for end, _ in finishing) if finishing else 0.0
+
+    def report(self, costs, actual_makespan, budgets=None):
+        if not self._estimator.calibrated:
+            print(
+                f"{YELLOW_COLOR}Scheduled {len(costs)} tasks on {self._num_workers} cores without timing history: "
+                f"actual makespan {actual_makespan:.1f}s{DEFAULT_COLOR}"
+            )
+            return None
+
+        predicted = self.predicted_makespan(costs, budgets)
+        print(
+            f"{YELLOW_COLOR}Scheduled {len(costs)} tasks on {self._num_workers} cores: "
+            f"predicted makespan {predicted:.1f}s, actual {actual_makespan:.1f}s{DEFAULT_COLOR}"
+        )
+        return predicted
@@ -14,6 +14,8 @@ GREEN_COLOR = '\033[32m'
 YELLOW_COLOR = '\033[33m'
 
 SAMPLING_TYPES = ['none', 'bootstrap', 'percent90']
+# cores given to each task of a category unless its algorithm sets `threads`
+DEFAULT_THREADS = {'classical': 1, 'dnn-based': 4}
 
 
 def _load_preset(path):
@@ -27,8 +29,22 @@ def _config_to_tasks(config):
         for params in algorithm['params']:
             for sampling in SAMPLING_TYPES:
                 runs = algorithm['runs'] if sampling == 'none' else algorithm['sample_runs']
-                for _ in range(runs):
-                    yield Task(algorithm['name'], feature_selectors[algorithm['name']](*params), dataset, config['n_informative'], sampling)
+                # large tasks train data-parallel on this many local processes
+                data_parallel = algorithm.get('data_parallel', 1)
+                threads = max(algorithm.get('threads', DEFAULT_THREADS.get(config.get('category'), 1)), data_parallel)
+                # runs are seeded seed, seed + 1, ... when the algorithm sets a `seed`
+                seed = algorithm.get('seed')
+                limits = {key: algorithm[key] for key in ('timeout', 'max_memory', 'retries') if key in algorithm}
+                if runs > 1 and algorithm.get('replicate_mode', False) and feature_selectors.info(algorithm['name']).supports_replicates:
+                    # a single task produces every resampled run
+                    yield Task(algorithm['name'], dataset, config['n_informative'], sampling, runs, data_parallel, params, threads=threads, seed=seed, **limits)
+                    continue
+                for run_index in range(runs):
+                    yield Task(
+                        algorithm['name'], dataset, config['n_informative'], sampling,
+                        data_parallel=data_parallel, params=params, run_index=run_index, threads=threads,
+                        seed=seed + run_index if seed is not None else None, **limits
+                    )
 
 
 def _print_preset(name, preset):
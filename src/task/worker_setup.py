@@ -0,0 +1,65 @@
+"""
+Set-up of the processes that run selection tasks.
+
+With the `forkserver` start method this module is preloaded by the fork server: its
+import loads the datasets described by `PRELOAD_DATASETS_ENV` into shared memory once,
+and every task process forked from the server starts with them attached and with the
+frameworks of its selectors already imported.
+"""
+import json
+import os
+
+from data.dataset_manager import DatasetManager
+from feature_selectors import feature_selectors
+from feature_selectors.base_models.nn_models.knockoffs import KnockoffFactorsCache
+from feature_selectors.base_models.nn_models.warm_start import WarmStartStore
+from util.shared_resources import SharedResources
+
+
+PRELOAD_DATASETS_ENV = 'GENEXPFS_PRELOAD_DATASETS'
+# imported by the fork server before it forks any task process
+PRELOAD_MODULES = ['task.runner', __name__]
+
+
+def preload_modules(selector_names=()):
+    """
+    Modules for task processes to start with: the task runner, this module and the
+    modules of the `selector_names` selectors, which import their frameworks.
+    """
+    selector_modules = sorted({feature_selectors.module(name) for name in selector_names})
+    return PRELOAD_MODULES + selector_modules
+
+
+def preload_datasets(base_path, relative_paths, normalize=True):
+    """
+    Describes the datasets for worker processes that do not inherit them; must be called
+    before the fork server starts.
+    """
+    os.environ[PRELOAD_DATASETS_ENV] = json.dumps(
+        {'base_path': base_path, 'relative_paths': relative_paths, 'normalize': normalize}
+    )
+
+
+def attach_datasets():
+    config = os.environ.get(PRELOAD_DATASETS_ENV)
+    if config is None or SharedResources.get() is not None:
+        return
+    config = json.loads(config)
+    SharedResources.set_resources(DatasetManager(config['base_path'], config['relative_paths'], config['normalize']))
+
+
+def setup_worker(datasets=None, warm_start_cache_dir=None, knockoffs_cache_dir=None):
+    """
+    Initializer of a task process: uses the inherited `datasets`, or the ones attached by
+    the fork server, or, for a spawned process, loads them itself, and points the caches
+    that task processes share at the directories of the run.
+    """
+    if datasets is not None:
+        SharedResources.set_resources(datasets)
+    else:
+        attach_datasets()
+    WarmStartStore.default_cache_dir = warm_start_cache_dir
+    KnockoffFactorsCache.default_cache_dir = knockoffs_cache_dir
+
+
+attach_datasets()
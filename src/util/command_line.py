@@ -101,6 +101,56 @@ def add_times_filename(parser):
     )
 
 
+def add_resume(parser):
+    parser.add_argument(
+        '--resume',
+        nargs='?',
+        const='',
+        default=None,
+        help='Skip selection tasks whose results already exist in the given results file or directory. '
+             '[default: the selection file]',
+        type=str
+    )
+
+
+def add_pin_cores(parser):
+    parser.add_argument(
+        '--pin-cores',
+        action='store_true',
+        help='Bind every selection task process to the cores of its thread budget.'
+    )
+
+
+def add_queue(parser, required=False):
+    parser.add_argument(
+        '--queue',
+        required=required,
+        default=None,
+        help='SQLite task queue on a path shared by the workers. With select, tasks are only enqueued '
+             'for `worker` processes to run.',
+        type=str
+    )
+
+
+def add_lease_seconds(parser):
+    parser.add_argument(
+        '--lease-seconds',
+        default=300,
+        help='Seconds a leased task stays with a worker without heartbeat before it is requeued.',
+        type=float
+    )
+
+
+def add_start_method(parser):
+    parser.add_argument(
+        '--start-method',
+        choices=['fork', 'forkserver', 'spawn'],
+        default='fork',
+        help='How task processes are started. forkserver forks them from a server that preloads the '
+             'frameworks and datasets once. [default: fork]'
+    )
+
+
 def add_verbosity(parser):
     parser.add_argument(
         '-v',
@@ -127,6 +177,9 @@ def get_args(arguments=None):
     add_stability_filename(all_parser)
     add_determinism_filename(all_parser)
     add_times_filename(all_parser)
+    add_resume(all_parser)
+    add_pin_cores(all_parser)
+    add_start_method(all_parser)
     add_verbosity(all_parser)
 
     # Feature Selection Command
@@ -137,8 +190,24 @@ def get_args(arguments=None):
     add_presets(feature_selection_parser)
     add_presets_runs(feature_selection_parser)
     add_selection_filename(feature_selection_parser)
+    add_resume(feature_selection_parser)
+    add_pin_cores(feature_selection_parser)
+    add_queue(feature_selection_parser)
+    add_start_method(feature_selection_parser)
     add_verbosity(feature_selection_parser)
 
+    # Queue Worker Command
+    worker_parser = subparsers.add_parser('worker', help='Run feature selection tasks leased from a shared task queue.')
+    add_queue(worker_parser, required=True)
+    add_num_workers(worker_parser)
+    add_results_path(worker_parser)
+    add_datasets_path(worker_parser)
+    add_selection_filename(worker_parser)
+    add_lease_seconds(worker_parser)
+    add_pin_cores(worker_parser)
+    add_start_method(worker_parser)
+    add_verbosity(worker_parser)
+
     # Scoring Command
     scoring_parser = subparsers.add_parser('scoring', help='Run selection scoring tasks.')
     add_results_path(scoring_parser)
@@ -3,11 +3,10 @@ resources = None
 
 class SharedResources:
     @staticmethod
-    def set_resources(datasets, lock):
+    def set_resources(datasets):
         global resources
         resources = {
-        "datasets": datasets,
-        "lock": lock
+        "datasets": datasets
         }
 
     @staticmethod
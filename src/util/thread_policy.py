@@ -0,0 +1,63 @@
+import os
+import sys
+
+from threadpoolctl import threadpool_limits
+
+
+# read by native libraries loaded after the policy is applied and inherited by subprocesses;
+# LOKY_MAX_CPU_COUNT also caps joblib's `n_jobs=-1`
+THREAD_ENV_VARS = (
+    'OMP_NUM_THREADS',
+    'OPENBLAS_NUM_THREADS',
+    'MKL_NUM_THREADS',
+    'BLIS_NUM_THREADS',
+    'VECLIB_MAXIMUM_THREADS',
+    'NUMEXPR_NUM_THREADS',
+    'LOKY_MAX_CPU_COUNT',
+)
+
+
+def available_cores():
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+class ThreadPolicy:
+    """
+    Thread limits applied in every worker process so that the workers together do not
+    start more threads than there are cores.
+
+    `apply` caps the BLAS/OpenMP pools already loaded (through threadpoolctl), the
+    environment seen by libraries loaded later, joblib, torch and TensorFlow at the
+    worker's budget. With `pin_cores`, the worker is also bound to the cores it was
+    given so its threads stay on them.
+    """
+
+    def __init__(self, n_threads=1, pin_cores=False):
+        self.n_threads = n_threads
+        self.pin_cores = pin_cores
+        self._limits = None
+
+    def apply(self, n_threads=None, cores=None):
+        n_threads = n_threads or (len(cores) if cores else self.n_threads)
+
+        for name in THREAD_ENV_VARS:
+            os.environ[name] = str(n_threads)
+        self._limits = threadpool_limits(limits=n_threads)
+
+        if 'torch' in sys.modules:
+            sys.modules['torch'].set_num_threads(n_threads)
+
+        # TensorFlow accepts the limits only until it runs its first op
+        if 'tensorflow' in sys.modules:
+            threading = sys.modules['tensorflow'].config.threading
+            try:
+                threading.set_intra_op_parallelism_threads(n_threads)
+                # ops run one at a time, each using the whole budget
+                threading.set_inter_op_parallelism_threads(1)
+            except RuntimeError:
+                pass
+
+        if self.pin_cores and cores and hasattr(os, 'sched_setaffinity'):
+            os.sched_setaffinity(0, cores)